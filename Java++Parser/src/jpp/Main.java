@@ -1,20 +1,34 @@
 package jpp;
 
+import java.io.BufferedOutputStream;
 import java.io.File;
+import java.io.IOException;
+import java.io.OutputStreamWriter;
+import java.io.Writer;
+import java.math.BigInteger;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Files;
 import java.nio.file.Path;
-import java.nio.file.StandardOpenOption;
+import java.nio.file.StandardCopyOption;
+import java.security.MessageDigest;
+import java.util.ArrayList;
 import java.util.Collection;
 import java.util.EnumSet;
+import java.util.LinkedHashSet;
 import java.util.List;
 import java.util.Map;
-import java.util.NoSuchElementException;
-import java.util.Scanner;
+import java.util.Set;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.Executors;
+import java.util.concurrent.Future;
 import java.util.function.BiFunction;
-import java.util.stream.Collectors;
+import java.util.regex.Pattern;
+
+import org.apache.commons.lang3.tuple.Pair;
 
 import jpp.parser.JavaPlusPlusParser;
 import jpp.parser.JavaPlusPlusParser.Feature;
+import jtree.parser.JavaParser;
 import lombok.SneakyThrows;
 import net.sourceforge.argparse4j.ArgumentParsers;
 import net.sourceforge.argparse4j.helper.MessageLocalization;
@@ -29,18 +43,25 @@ import net.sourceforge.argparse4j.inf.Namespace;
 
 public class Main {
 	
-	public static void main(String[] args) {
-		var parser = ArgumentParsers.newFor("java++")
+	private static final int OUTPUT_BUFFER_SIZE = 1 << 16;
+	private static final Pattern SOURCE_FILE_REGEX = Pattern.compile("(?i).*\\.j(pp|ava(pp)?)"),
+								 JAVA_FILE_REGEX = Pattern.compile("(?i).*\\.java");
+	
+	private static final ArgumentParser parser;
+	private static final Argument filesArg, listFeaturesArg;
+	
+	static {
+		parser = ArgumentParsers.newFor("java++")
 				.fromFilePrefix("@")
 				.singleMetavar(true)
 				.build()
 				.description("Parse Java++ code from files");
-		var filesArg = parser.addArgument("files")
+		filesArg = parser.addArgument("files")
 				.type(Arguments.fileType().acceptSystemIn().verifyCanRead().verifyExists().verifyIsFile().or().acceptSystemIn().verifyExists().verifyIsDirectory())
 				.nargs("*")
 				.metavar("FILE")
 				.help("The files to parse");
-		var listFeaturesArg = parser.addArgument("--list-features")
+		listFeaturesArg = parser.addArgument("--list-features")
 				.action(Arguments.storeTrue())
 				.help("Print a list of supported features and exit");
 		parser.addArgument("--enable", "-e")
@@ -58,7 +79,16 @@ public class Main {
 		parser.addArgument("--recursive", "-r")
 				.action(Arguments.storeTrue())
 				.help("Look through subdirectories of folders as well");
-		
+		parser.addArgument("--jobs", "-j")
+				.type(Integer.class)
+				.metavar("N")
+				.help("The number of files to convert in parallel (default: the number of available processors)");
+		parser.addArgument("--cache")
+				.action(Arguments.storeTrue())
+				.help("Reuse the output of previous conversions of unchanged files");
+	}
+	
+	public static void main(String[] args) {
 		Namespace ns;
 		try {
 			ns = parser.parseArgs(args);
@@ -75,6 +105,10 @@ public class Main {
     					argName = "out";
     				} else if(ns.getBoolean("recursive")) {
     					argName = "recursive";
+    				} else if(ns.get("jobs") != null) {
+    					argName = "jobs";
+    				} else if(ns.getBoolean("cache")) {
+    					argName = "cache";
     				} else {
     					break validate_args;
     				}
@@ -100,7 +134,7 @@ public class Main {
 		
 		if(ns.getBoolean("list_features")) {
 			System.out.println("Features:");
-			for(var feature : Feature.VALUES.stream().sorted((feature1, feature2) -> feature1.id.compareTo(feature2.id)).collect(Collectors.toList())) {
+			for(var feature : Feature.VALUES_BY_ID) {
 				System.out.println(feature);
 			}
 			System.exit(1);
@@ -115,82 +149,218 @@ public class Main {
 		
 		EnumSet<Feature> enabledFeatures = ns.get("enable"),
 						 disabledFeatures = ns.get("disable");
+		var features = Feature.enabledByDefault();
 		BiFunction<CharSequence, String, JavaPlusPlusParser> parserSupplier;
 		if(enabledFeatures.isEmpty() && disabledFeatures.isEmpty()) {
 			parserSupplier = JavaPlusPlusParser::new;
 		} else {
-			var features = Feature.enabledByDefault();
 			features.addAll(enabledFeatures);
 			features.removeAll(disabledFeatures);
 			parserSupplier = (code, filename) -> new JavaPlusPlusParser(code, filename, features);
 		}
 		
-		parseFiles(ns.getList("files"), parserSupplier, ns.getBoolean("recursive"), outPath);
+		var cache = ns.getBoolean("cache")? new ConversionCache(Path.of(System.getProperty("user.home"), ".cache", "javapp"), features) : null;
+		
+		Integer jobs = ns.get("jobs");
+		
+		parseFiles(ns.getList("files"), parserSupplier, ns.getBoolean("recursive"), outPath, jobs == null? Runtime.getRuntime().availableProcessors() : jobs, cache);
 	}
 	
-	private static void parseFiles(List<File> files, BiFunction<CharSequence, String, JavaPlusPlusParser> parserCreator, boolean recursive, Path outDir) {
+	@SneakyThrows
+	private static void parseFiles(List<File> files, BiFunction<CharSequence, String, JavaPlusPlusParser> parserCreator, boolean recursive, Path outDir, int jobs, ConversionCache cache) {
+		var tasks = new ArrayList<Pair<File, Path>>();
 		for(var file : files) {
 			if(file.isDirectory()) {
 				var newOutDir = outDir.resolve(file.getName());
-				for(var subfile : file.listFiles(f -> f.isDirectory() || f.getName().matches("(?i).*\\.j(pp|ava(pp)?)"))) {
-					parseFile(subfile, parserCreator, recursive, newOutDir);
+				for(var subfile : file.listFiles(f -> f.isDirectory() || SOURCE_FILE_REGEX.matcher(f.getName()).matches())) {
+					collectFiles(subfile, recursive, newOutDir, tasks);
 				}
 			} else {
-				parseFile(file, parserCreator, recursive, outDir);
+				tasks.add(Pair.of(file, outDir));
+			}
+		}
+		
+		if(tasks.isEmpty()) {
+			return;
+		}
+		
+		if(tasks.size() == 1) {
+			var task = tasks.get(0);
+			parseFile(task.getLeft(), Files.readAllBytes(task.getLeft().toPath()), parserCreator, task.getRight(), cache);
+			return;
+		}
+		
+		if(jobs <= 1) {
+			// read the next file in the background while the current one is being converted
+			var reader = Executors.newSingleThreadExecutor();
+			try {
+				var firstFile = tasks.get(0).getLeft();
+				var next = reader.submit(() -> Files.readAllBytes(firstFile.toPath()));
+				for(int i = 0; i < tasks.size(); i++) {
+					var task = tasks.get(i);
+					byte[] bytes;
+					try {
+						bytes = next.get();
+					} catch(ExecutionException e) {
+						throw e.getCause();
+					}
+					if(i+1 < tasks.size()) {
+						var nextFile = tasks.get(i+1).getLeft();
+						next = reader.submit(() -> Files.readAllBytes(nextFile.toPath()));
+					}
+					parseFile(task.getLeft(), bytes, parserCreator, task.getRight(), cache);
+				}
+			} finally {
+				reader.shutdownNow();
+			}
+			return;
+		}
+		
+		var executor = Executors.newFixedThreadPool(Math.min(jobs, tasks.size()));
+		try {
+			var results = new ArrayList<Future<?>>(tasks.size());
+			for(var task : tasks) {
+				results.add(executor.submit(() -> {
+					parseFile(task.getLeft(), Files.readAllBytes(task.getLeft().toPath()), parserCreator, task.getRight(), cache);
+					return null;
+				}));
 			}
+			for(var result : results) {
+				try {
+					result.get();
+				} catch(ExecutionException e) {
+					throw e.getCause();
+				}
+			}
+		} finally {
+			executor.shutdownNow();
 		}
 	}
 	
-	@SneakyThrows
-	private static void parseFile(File file, BiFunction<CharSequence, String, JavaPlusPlusParser> parserCreator, boolean recursive, Path outDir) {
+	private static void collectFiles(File file, boolean recursive, Path outDir, List<Pair<File, Path>> tasks) {
 		if(file.isDirectory()) {
 			if(recursive) {
 				var newOutDir = outDir.resolve(file.getName());
-				for(var subfile : file.listFiles(f -> f.isDirectory() || f.getName().matches("(?i).*\\.j(pp|ava(pp)?)"))) {
-					parseFile(subfile, parserCreator, recursive, newOutDir);
+				for(var subfile : file.listFiles(f -> f.isDirectory() || SOURCE_FILE_REGEX.matcher(f.getName()).matches())) {
+					collectFiles(subfile, recursive, newOutDir, tasks);
 				}
 			}
 		} else {
-			CharSequence text;
-			try(var scan = new Scanner(file)) {
-				scan.useDelimiter("\\A");
-				text = scan.next();
-			} catch(NoSuchElementException e) {
-				System.out.print("Skipped ");
-				System.out.println(file);
-				return;
-			}
-			
-			var parser = parserCreator.apply(text, file.getName());
+			tasks.add(Pair.of(file, outDir));
+		}
+	}
+	
+	@SneakyThrows
+	private static void parseFile(File file, byte[] bytes, BiFunction<CharSequence, String, JavaPlusPlusParser> parserCreator, Path outDir, ConversionCache cache) {
+		if(bytes.length == 0) {
+			System.out.println("Skipped " + file);
+			return;
+		}
+		
+		String name;
+		if(JAVA_FILE_REGEX.matcher(file.getName()).matches() && outDir.toAbsolutePath().equals(file.getParentFile().toPath())) {
+			name = file.getName();
+			int i = name.lastIndexOf('.');
+			name = name.substring(0, i) + "_converted.java";
+		} else {
+			name = file.getName();
+			int i = name.lastIndexOf('.');
+			name = name.substring(0, i) + ".java";
+		}
+		
+		Path out = outDir.resolve(name);
+		
+		if(cache == null) {
+			var parser = parserCreator.apply(new String(bytes, StandardCharsets.UTF_8), file.getName());
 			
 			var unit = parser.parseCompilationUnit();
 			
-			String name;
-			if(file.getName().matches("(?i).*\\.java") && outDir.toAbsolutePath().equals(file.getParentFile().toPath())) {
-				name = file.getName();
-				int i = name.lastIndexOf('.');
-				name = name.substring(0, i) + "_converted.java";
+			try(var writer = newOutputWriter(out)) {
+				unit.writeCode(writer);
+			}
+		} else {
+			var key = cache.key(bytes);
+			var code = cache.get(key);
+			if(code == null) {
+				var parser = parserCreator.apply(new String(bytes, StandardCharsets.UTF_8), file.getName());
+				
+				code = parser.parseCompilationUnit().toCode();
+				cache.put(key, code);
+			}
+			try(var writer = newOutputWriter(out)) {
+				writer.write(code);
+			}
+		}
+		System.out.println("Converted " + file);
+	}
+	
+	private static Writer newOutputWriter(Path out) throws IOException {
+		return new OutputStreamWriter(new BufferedOutputStream(Files.newOutputStream(out), OUTPUT_BUFFER_SIZE), StandardCharsets.UTF_8);
+	}
+	
+	private static class ConversionCache {
+		private final Path dir;
+		private final byte[] salt;
+		
+		@SneakyThrows
+		ConversionCache(Path dir, Set<Feature> features) {
+			this.dir = dir;
+			var version = new StringBuilder();
+			var locations = new LinkedHashSet<Path>();
+			for(var cls : List.of(JavaPlusPlusParser.class, JavaParser.class)) {
+				locations.add(Path.of(cls.getProtectionDomain().getCodeSource().getLocation().toURI()));
+			}
+			for(var location : locations) {
+				version.append(location).append('@').append(stamp(location)).append(':');
+			}
+			this.salt = (version.toString() + features).getBytes(StandardCharsets.UTF_8);
+			Files.createDirectories(dir);
+		}
+		
+		/**
+		 * @return the modification time of a jar, or the file count and latest modification time of a class directory
+		 */
+		private static String stamp(Path location) throws IOException {
+			if(Files.isDirectory(location)) {
+				try(var files = Files.walk(location)) {
+					var stats = files.filter(Files::isRegularFile).mapToLong(file -> file.toFile().lastModified()).summaryStatistics();
+					return stats.getCount() + "/" + stats.getMax();
+				}
 			} else {
-				name = file.getName();
-				int i = name.lastIndexOf('.');
-				name = name.substring(0, i) + ".java";
+				return Long.toString(Files.getLastModifiedTime(location).toMillis());
 			}
-			
-			Path out = outDir.resolve(name);
-			
-			Files.writeString(out, unit.toCode(), StandardOpenOption.CREATE);
-			System.out.print("Converted ");
-			System.out.println(file);
+		}
+		
+		@SneakyThrows
+		String key(byte[] source) {
+			var digest = MessageDigest.getInstance("SHA-256");
+			digest.update(salt);
+			digest.update(source);
+			return String.format("%064x", new BigInteger(1, digest.digest()));
+		}
+		
+		@SneakyThrows
+		String get(String key) {
+			var file = dir.resolve(key + ".java");
+			return Files.isRegularFile(file)? Files.readString(file) : null;
+		}
+		
+		@SneakyThrows
+		void put(String key, String code) {
+			var temp = Files.createTempFile(dir, key, ".tmp");
+			Files.writeString(temp, code);
+			Files.move(temp, dir.resolve(key + ".java"), StandardCopyOption.REPLACE_EXISTING, StandardCopyOption.ATOMIC_MOVE);
 		}
 	}
 	
 }
 
 class FeatureType implements ArgumentType<EnumSet<Feature>> {
+	private static final Pattern ALL_FEATURES_REGEX = Pattern.compile("\\s*\\*\\s*");
 
 	@Override
 	public EnumSet<Feature> convert(ArgumentParser parser, Argument arg, String value) throws ArgumentParserException {
-		if(value.matches("\\s*\\*\\s*")) {
+		if(ALL_FEATURES_REGEX.matcher(value).matches()) {
 			return EnumSet.allOf(Feature.class);
 		}
 		var result = EnumSet.noneOf(Feature.class);
@@ -206,21 +376,11 @@ class FeatureType implements ArgumentType<EnumSet<Feature>> {
 			if(loop) {
 				value = value.substring(i+1);
 			}
-			if(sub.endsWith(".*")) {
-				String prefix = sub.substring(0, sub.length()-1); // removes the '*'
-				for(var feature : Feature.VALUES) {
-					if(feature.id.startsWith(prefix)) {
-						found = true;
-						result.add(feature);
-					}
-				}
-			} else {
-    			for(var feature : Feature.VALUES) {
-    	            if(feature.id.equals(sub)) {
-    	                result.add(feature);
-    	                found = true;
-    	            }
-    	        }
+			try {
+				result.addAll(Feature.fromPattern(sub));
+				found = true;
+			} catch(IllegalArgumentException e) {
+				found = false;
 			}
 		} while(found && loop);
 
@@ -248,7 +408,7 @@ class FeatureJoiningAction implements ArgumentAction {
         if(attrs.containsKey(arg.getDest())) {
             Object obj = attrs.get(arg.getDest());
             if(obj instanceof EnumSet) {
-            	var set = (EnumSet<Feature>)obj;
+            	var set = EnumSet.copyOf((EnumSet<Feature>)obj);
             	if(value instanceof Feature) {
             		set.add((Feature)value);
             	} else {
@@ -260,6 +420,7 @@ class FeatureJoiningAction implements ArgumentAction {
 	            		}
             		}
             	}
+            	attrs.put(arg.getDest(), set);
                 return;
             } else if(obj instanceof List) {
             	EnumSet<Feature> set;
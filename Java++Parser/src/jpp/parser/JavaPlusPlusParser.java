@@ -5,23 +5,27 @@ import static jpp.parser.Names.Name;
 import static jpp.parser.QualNames.*;
 import static jtree.parser.JavaTokenType.*;
 import static jtree.util.Utils.emptyList;
+import static jtree.util.Utils.unescapeJava;
 
 import java.util.ArrayList;
 import java.util.Collection;
 import java.util.Collections;
+import java.util.Comparator;
 import java.util.EnumSet;
+import java.util.HashMap;
 import java.util.HashSet;
 import java.util.LinkedHashSet;
 import java.util.List;
+import java.util.Map;
 import java.util.Optional;
 import java.util.Set;
+import java.util.function.Function;
 import java.util.function.Predicate;
 import java.util.function.Supplier;
 import java.util.regex.Pattern;
 import java.util.stream.Collectors;
 
 import org.apache.commons.lang3.tuple.Pair;
-import org.apache.commons.text.StringEscapeUtils;
 
 import jpp.nodes.DefaultFormalParameter;
 import jpp.nodes.EnableDisableStmt;
@@ -156,6 +160,7 @@ public class JavaPlusPlusParser extends JavaParser {
 		;
 
 		public static final Set<Feature> VALUES = Collections.unmodifiableSet(EnumSet.allOf(Feature.class));
+		public static final List<Feature> VALUES_BY_ID = VALUES.stream().sorted(Comparator.comparing(feature -> feature.id)).collect(Collectors.toUnmodifiableList());
 
 		public final String id;
 		@Getter
@@ -171,14 +176,56 @@ public class JavaPlusPlusParser extends JavaParser {
 			return id;
 		}
 		
-		public static EnumSet<Feature> enabledByDefault() {
-			var features = EnumSet.noneOf(Feature.class);
+		private static final Map<String, Feature> ID_TO_FEATURE = VALUES.stream().collect(Collectors.toMap(feature -> feature.id, feature -> feature));
+		
+		public static Feature fromId(String id) {
+			var result = ID_TO_FEATURE.get(id);
+			if(result == null) {
+				throw new IllegalArgumentException("No feature found matching '" + id + "'");
+			}
+			return result;
+		}
+		
+		private static final Map<String, Set<Feature>> PREFIX_TO_FEATURES = new HashMap<>();
+		static {
+			for(var feature : VALUES) {
+				for(int i = feature.id.indexOf('.'); i != -1; i = feature.id.indexOf('.', i+1)) {
+					PREFIX_TO_FEATURES.computeIfAbsent(feature.id.substring(0, i+1), prefix -> EnumSet.noneOf(Feature.class)).add(feature);
+				}
+			}
+			PREFIX_TO_FEATURES.replaceAll((prefix, features) -> Collections.unmodifiableSet(features));
+		}
+		
+		/**
+		 * @param pattern a feature id, a feature id prefix followed by {@code .*}, or {@code *}
+		 * @return the features matched by the pattern
+		 * @throws IllegalArgumentException If the pattern matches no features.
+		 */
+		public static Set<Feature> fromPattern(String pattern) {
+			if(pattern.equals("*")) {
+				return VALUES;
+			} else if(pattern.endsWith(".*") && pattern.length() > 2) {
+				var result = PREFIX_TO_FEATURES.get(pattern.substring(0, pattern.length()-1)); // removes the *
+				if(result == null) {
+					throw new IllegalArgumentException("No feature found matching '" + pattern + "'");
+				}
+				return result;
+			} else {
+				return Set.of(fromId(pattern));
+			}
+		}
+		
+		private static final EnumSet<Feature> ENABLED_BY_DEFAULT = EnumSet.noneOf(Feature.class);
+		static {
 			for(var feature : VALUES) {
 				if(feature.isEnabledByDefault()) {
-					features.add(feature);
+					ENABLED_BY_DEFAULT.add(feature);
 				}
 			}
-			return features;
+		}
+		
+		public static EnumSet<Feature> enabledByDefault() {
+			return ENABLED_BY_DEFAULT.clone();
 		}
 	}
 	
@@ -196,6 +243,12 @@ public class JavaPlusPlusParser extends JavaParser {
 	
 	protected EnumSet<Feature> enabledFeatures;
 	protected final Set<ImportDecl> imports = new HashSet<>();
+
+	protected static final TokenPredicate<JavaTokenType> RBRACE_OR_ENDMARKER = RBRACE.or(ENDMARKER);
+	protected static final TokenPredicate<JavaTokenType> NOT_LPAREN_OR_SEMI = not(LPAREN.or(SEMI));
+	protected static final TokenPredicate<JavaTokenType> GET_OR_SET = GET.or(SET);
+	protected static final TokenPredicate<JavaTokenType> ACCESSOR_BODY_START = LPAREN.or(ARROW).or(LBRACE).or(SEMI);
+	protected static final TokenPredicate<JavaTokenType> OPTIONAL_LITERAL_FOLLOW = RPAREN.or(RBRACE).or(RBRACKET).or(COMMA).or(SEMI);
 	
 	public JavaPlusPlusParser(CharSequence text) {
 		super(text);
@@ -251,40 +304,11 @@ public class JavaPlusPlusParser extends JavaParser {
 	}
 	
 	public void setEnabled(String featureId, boolean enabled) {
-		if(featureId.equals("*")) {
-			if(enabled) {
-				enabledFeatures.addAll(Feature.VALUES);
-			} else {
-				enabledFeatures.clear();
-			}
-		} else if(featureId.endsWith(".*") && featureId.length() > 2) {
-			String prefix = featureId.substring(0, featureId.length()-1); // removes the *
-			boolean found = false;
-			for(var feature : Feature.VALUES) {
-				if(feature.id.startsWith(prefix)) {
-					found = true;
-					if(enabled) {
-						enabledFeatures.add(feature);
-					} else {
-						enabledFeatures.remove(feature);
-					}
-				}
-			}
-			if(!found) {
-				throw new IllegalArgumentException("No feature found matching '" + featureId + "'");
-			}
+		var features = Feature.fromPattern(featureId);
+		if(enabled) {
+			enabledFeatures.addAll(features);
 		} else {
-			for(var feature : Feature.VALUES) {
-				if(feature.id.equals(featureId)) {
-					if(enabled) {
-						enabledFeatures.add(feature);
-					} else {
-						enabledFeatures.remove(feature);
-					}
-					return;
-				}
-			}
-			throw new IllegalArgumentException("No feature found matching '" + featureId + "'");
+			enabledFeatures.removeAll(features);
 		}
 	}
 	
@@ -293,20 +317,10 @@ public class JavaPlusPlusParser extends JavaParser {
 	}
 	
 	protected boolean imported(QualifiedName type) {
-		for(var importdecl : imports) {
-			if(!importdecl.isStatic()) {
-				if(importdecl.isWildcard()) {
-					if(importdecl.getName().equals(type.subName(0, type.nameCount()-1))) {
-						return true;
-					}
-				} else {
-					if(importdecl.getName().equals(type)) {
-						return true;
-					}
-				}
-			}
+		if(imports.contains(new ImportDecl(type))) {
+			return true;
 		}
-		return false;
+		return type.nameCount() > 1 && imports.contains(new ImportDecl(type.subName(0, type.nameCount()-1), false, true));
 	}
 	
 	protected boolean importedNameOtherThan(String name) {
@@ -335,7 +349,7 @@ public class JavaPlusPlusParser extends JavaParser {
 		var entries = new ArrayList<REPLEntry>();
 		loop:
 		while(!wouldAccept(ENDMARKER)) {
-    		if(wouldAccept(AT.or(KEYWORD_MODIFIER)) || wouldAcceptPseudoOp(test("non"), SUB, KEYWORD_MODIFIER.and(not(Tag.VISIBILITY_MODIFIER)))) {
+    		if(wouldAccept(AT.or(KEYWORD_MODIFIER)) || wouldAcceptPseudoOp(NON, SUB, KEYWORD_MODIFIER.and(not(Tag.VISIBILITY_MODIFIER)))) {
     			var docComment = getDocComment();
     			var modsAndAnnos = new ModsAndAnnotations(emptyList(), parseAnnotations());
     			if(wouldAccept(PACKAGE, Tag.NAMED, DOT.or(SEMI).or(ENDMARKER))) {
@@ -447,8 +461,9 @@ public class JavaPlusPlusParser extends JavaParser {
 	public CompilationUnit parseCompilationUnit() {
 		var unit = super.parseCompilationUnit();
 		var imports = unit.getImports();
+		var existing = new HashSet<>(imports);
 		for(var importdecl : this.imports) {
-			if(!imports.contains(importdecl)) {
+			if(existing.add(importdecl)) {
 				imports.add(importdecl);
 			}
 		}
@@ -592,20 +607,25 @@ public class JavaPlusPlusParser extends JavaParser {
 		require(UNIMPORT);
 		var imports = parseImportRest(true);
 		if(!imports.isEmpty()) {
-			Predicate<ImportDecl> inImports = decl -> {
-				for(var decl2 : imports) {
-					if(decl.equals(decl2)) {
-						return true;
-					} else if(decl.isStatic() == decl2.isStatic() && decl2.isWildcard() && !decl.isWildcard() && decl.getName().subName(0, decl.getName().nameCount()-1).equals(decl2.getName())) {
-						return true;
-					}
-				}
-				return false;
-			};
+			var inImports = coveredBy(imports);
 			imports1.removeIf(inImports);
 			imports2.removeIf(inImports);
 		}
 	}
+	
+	protected static Predicate<ImportDecl> coveredBy(List<ImportDecl> imports) {
+		var decls = new HashSet<>(imports);
+		var wildcards = new HashSet<QualifiedName>();
+		var staticWildcards = new HashSet<QualifiedName>();
+		for(var decl : imports) {
+			if(decl.isWildcard()) {
+				(decl.isStatic()? staticWildcards : wildcards).add(decl.getName());
+			}
+		}
+		return decl -> decls.contains(decl)
+				|| !decl.isWildcard() && decl.getName().nameCount() > 1
+				   && (decl.isStatic()? staticWildcards : wildcards).contains(decl.getName().subName(0, decl.getName().nameCount()-1));
+	}
 
 	@Override
 	public List<ImportDecl> parseImport() {
@@ -680,16 +700,7 @@ public class JavaPlusPlusParser extends JavaParser {
 		requireSemi();
 		if(unimport) {
 			if(!imports.isEmpty()) {
-				Predicate<ImportDecl> inImports = decl -> {
-					for(var decl2 : imports) {
-						if(decl.equals(decl2)) {
-							return true;
-						} else if(decl.isStatic() == decl2.isStatic() && decl2.isWildcard() && !decl.isWildcard() && decl.getName().subName(0, decl.getName().nameCount()-1).equals(decl2.getName())) {
-							return true;
-						}
-					}
-					return false;
-				};
+				var inImports = coveredBy(imports);
 				imports1.removeIf(inImports);
 				imports2.removeIf(inImports);
 			}
@@ -878,11 +889,11 @@ public class JavaPlusPlusParser extends JavaParser {
 	
 	protected List<Member> applyMemberPreStmts(List<Member> members) {
 		if(preStmts.isWithinContext() && !preStmts.isEmpty()) {
-			var newmembers = new ArrayList<>(members);
 			var stmts = preStmts.get();
+			var newmembers = new ArrayList<Member>(stmts.size() + members.size());
 			boolean isStatic = context.current() == Context.STATIC;
-			for(int i = stmts.size()-1; i >= 0; i--) {
-				var stmt = stmts.get(i);
+			Block block = null;
+			for(var stmt : stmts) {
 				if(stmt instanceof VariableDecl) {
 					var varDecl = (VariableDecl)stmt;
 					if(isStatic) {
@@ -893,32 +904,18 @@ public class JavaPlusPlusParser extends JavaParser {
 					if(!varDecl.hasVisibilityModifier()) {
 						varDecl.getModifiers().add(createModifier("private"));
 					}
+					newmembers.add(varDecl);
+					block = null;
+				} else if(block == null) {
+					block = stmt instanceof Block? (Block)stmt : new Block(stmt);
+					newmembers.add(new ClassInitializer(isStatic, block));
+				} else if(stmt instanceof Block) {
+					block.getStatements().addAll(((Block)stmt).getStatements());
 				} else {
-					if(i < stmts.size()-1) {
-						var last = stmts.get(i+1);
-						if(last instanceof Block) {
-							if(stmt instanceof Block) {
-								((Block)last).getStatements().addAll(0, ((Block)stmt).getStatements());
-							} else {
-								((Block)last).getStatements().add(0, stmt);
-							}
-							stmts.remove(i);
-							continue;
-						}
-					}
-					if(!(stmt instanceof Block)) {
-						stmts.set(i, new Block(stmt));
-					}
-				}
-			}
-			for(int i = stmts.size()-1; i >= 0; i--) {
-				var stmt = stmts.get(i);
-				if(stmt instanceof Block) {
-					newmembers.add(0, new ClassInitializer(isStatic, (Block)stmt));
-				} else {
-					newmembers.add(0, (VariableDecl)stmt);
+					block.getStatements().add(stmt);
 				}
 			}
+			newmembers.addAll(members);
 			return newmembers;
 		} else {
 			return members;
@@ -1171,7 +1168,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					throw syntaxError("Duplicate modifier '" + token.getString() + "'");
 				}
 				nextToken();
-			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(test("non"), SUB, KEYWORD_MODIFIER)) {
+			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(NON, SUB, KEYWORD_MODIFIER)) {
 				nextToken(2);
 				if(mods.contains(token.getString())) {
 					throw syntaxError("Incompatible modifiers '" + token.getString() + "' and 'non-" + token.getString() + "'");
@@ -1212,7 +1209,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					throw syntaxError("Duplicate modifier '" + token.getString() + "'");
 				}
 				nextToken();
-			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(test("non"), SUB, Tag.CLASS_MODIFIER)) {
+			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(NON, SUB, Tag.CLASS_MODIFIER)) {
 				nextToken(2);
 				if(mods.contains(token.getString())) {
 					throw syntaxError("Incompatible modifiers '" + token.getString() + "' and 'non-" + token.getString() + "'");
@@ -1287,7 +1284,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					throw syntaxError("Duplicate modifier '" + token.getString() + "'");
 				}
 				nextToken();
-			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(test("non"), SUB, Tag.METHOD_MODIFIER)) {
+			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(NON, SUB, Tag.METHOD_MODIFIER)) {
 				nextToken(2);
 				if(mods.contains(token.getString())) {
 					throw syntaxError("Incompatible modifiers '" + token.getString() + "' and 'non-" + token.getString() + "'");
@@ -1330,7 +1327,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					throw syntaxError("Duplicate modifier '" + token.getString() + "'");
 				}
 				nextToken();
-			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(test("non"), SUB, Tag.CONSTRUCTOR_MODIFIER)) {
+			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(NON, SUB, Tag.CONSTRUCTOR_MODIFIER)) {
 				nextToken(2);
 				if(mods.contains(token.getString())) {
 					throw syntaxError("Incompatible modifiers '" + token.getString() + "' and 'non-" + token.getString() + "'");
@@ -1373,7 +1370,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					throw syntaxError("Duplicate modifier '" + token.getString() + "'");
 				}
 				nextToken();
-			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(test("non"), SUB, Tag.FIELD_MODIFIER)) {
+			} else if(enabled(DEFAULT_MODIFIERS) && wouldAcceptPseudoOp(NON, SUB, Tag.FIELD_MODIFIER)) {
 				nextToken(2);
 				if(mods.contains(token.getString())) {
 					throw syntaxError("Incompatible modifiers '" + token.getString() + "' and 'non-" + token.getString() + "'");
@@ -1521,7 +1518,7 @@ public class JavaPlusPlusParser extends JavaParser {
 				}
 				nextToken();
 				args.add(new Variable(parameters.get(args.size()).getName()));
-			} else if(wouldAccept(STAR, COMMA.or(RPAREN))) {
+			} else if(wouldAccept(STAR, COMMA_OR_RPAREN)) {
 				hadStar = true;
 				nextToken();
 				for(var param : parameters) {
@@ -1540,7 +1537,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					}
 					nextToken();
 					args.add(new Variable(parameters.get(args.size()).getName()));
-				} else if(wouldAccept(STAR, COMMA.or(RPAREN))) {
+				} else if(wouldAccept(STAR, COMMA_OR_RPAREN)) {
 					if(hadStar) {
 						throw syntaxError("Cannot use * more than once in explicit constructor call");
 					} else {
@@ -1602,6 +1599,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	
 	@Override
 	public ArrayList<FormalParameter> parseFormalParameterList(Supplier<Name> parseName) {
+		boolean trailingCommas = enabled(TRAILING_COMMAS);
 		var params = new ArrayList<FormalParameter>();
 		var eitherParam = parseFormalParameterWithOptDefault(parseName);
 		while(eitherParam.isSecond()) {
@@ -1613,7 +1611,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			if(!accept(COMMA)) {
 				break;
 			}
-			if(enabled(TRAILING_COMMAS) && wouldAccept(RPAREN)) {
+			if(trailingCommas && wouldAccept(RPAREN)) {
 				break;
 			}
 			eitherParam = parseFormalParameterWithOptDefault(parseName, param);
@@ -1622,7 +1620,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			FormalParameter param = eitherParam.first();
 			params.add(param);
 			while(!param.isVariadic() && accept(COMMA)) {
-				if(enabled(TRAILING_COMMAS) && wouldAccept(RPAREN)) {
+				if(trailingCommas && wouldAccept(RPAREN)) {
 					break;
 				}
 				params.add(param = parseFormalParameterWithDefault(parseName, param));
@@ -1673,7 +1671,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			name = parseName.get();
 		}		
 		var dimensions = parseDimensions();
-		if(enabled(DEFAULT_ARGUMENTS) && (wouldAccept(EQ) || enabled(SIZED_ARRAY_INITIALIZER) && wouldAccept(AT.or(LBRACKET)))) {
+		if(enabled(DEFAULT_ARGUMENTS) && (wouldAccept(EQ) || enabled(SIZED_ARRAY_INITIALIZER) && wouldAccept(ANNOTATION_OR_LBRACKET))) {
 			Type initType;
 			if(variadic) {
 				if(type instanceof ArrayType) {
@@ -1685,7 +1683,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			} else {
 				initType = type;
 			}
-			boolean arraySizeInit = wouldAccept(AT.or(LBRACKET));
+			boolean arraySizeInit = wouldAccept(ANNOTATION_OR_LBRACKET);
 			var initializer = parseVariableInitializer(initType, dimensions);
 			if(variadic && arraySizeInit) {
 				dimensions.remove(0);
@@ -1698,15 +1696,17 @@ public class JavaPlusPlusParser extends JavaParser {
 				dimensions.clear();
 			}
 			if(variadic && !arraySizeInit && accept(COMMA)) {
-				if(!enabled(TRAILING_COMMAS) || !wouldAccept(RPAREN)) {
+				boolean trailingCommas = enabled(TRAILING_COMMAS);
+				if(!trailingCommas || !wouldAccept(RPAREN)) {
+					int arrayDepth = dimensionCount(type, dimensions);
 					var elements = new ArrayList<Initializer>();
 					elements.add(initializer);
-					elements.add(parseInitializer(dimensionCount(type, dimensions)));
+					elements.add(parseInitializer(arrayDepth));
 					while(accept(COMMA)) {
-						if(enabled(TRAILING_COMMAS) && wouldAccept(RPAREN)) {
+						if(trailingCommas && wouldAccept(RPAREN)) {
 							break;
 						}
-						elements.add(parseInitializer(dimensionCount(type, dimensions)));
+						elements.add(parseInitializer(arrayDepth));
 					}
 					initializer = new ArrayInitializer<>(elements);
 				}
@@ -1800,7 +1800,7 @@ public class JavaPlusPlusParser extends JavaParser {
 				return new FormalParameter(type, name, variadic, dimensions, modifiers, annotations);
 			}
 		}
-		boolean arraySizeInit = wouldAccept(AT.or(LBRACKET));
+		boolean arraySizeInit = wouldAccept(ANNOTATION_OR_LBRACKET);
 		var initializer = parseVariableInitializer(type, dimensions);
 		if(variadic && arraySizeInit) {
 			dimensions.remove(0);
@@ -1813,15 +1813,17 @@ public class JavaPlusPlusParser extends JavaParser {
 			dimensions.clear();
 		}
 		if(variadic && !arraySizeInit && accept(COMMA)) {
-			if(!enabled(TRAILING_COMMAS) || !wouldAccept(RPAREN)) {
+			boolean trailingCommas = enabled(TRAILING_COMMAS);
+			if(!trailingCommas || !wouldAccept(RPAREN)) {
+				int arrayDepth = dimensionCount(type, dimensions);
 				var elements = new ArrayList<Initializer>();
 				elements.add(initializer);
-				elements.add(parseInitializer(dimensionCount(type, dimensions)));
+				elements.add(parseInitializer(arrayDepth));
 				while(accept(COMMA)) {
-					if(enabled(TRAILING_COMMAS) && wouldAccept(RPAREN)) {
+					if(trailingCommas && wouldAccept(RPAREN)) {
 						break;
 					}
-					elements.add(parseInitializer(dimensionCount(type, dimensions)));
+					elements.add(parseInitializer(arrayDepth));
 				}
 				initializer = new ArrayInitializer<>(elements);
 			}
@@ -2073,18 +2075,19 @@ public class JavaPlusPlusParser extends JavaParser {
 			var members = new ArrayList<Member>();
 			var modifiers = modsAndAnnos.mods;
 			var annotations = modsAndAnnos.annos;
+			boolean gettersAndSetters = enabled(GETTERS_AND_SETTERS), trailingCommas = enabled(TRAILING_COMMAS);
 			var declarators = new ArrayList<VariableDeclarator>();
 			var declarator = parseVariableDeclarator(type);
 			declarators.add(declarator);
-			if(enabled(GETTERS_AND_SETTERS) && wouldAccept(LBRACE)) {
+			if(gettersAndSetters && wouldAccept(LBRACE)) {
 				members.addAll(parseGetterAndSetters(type, declarator));
 			}
 			while(accept(COMMA)) {
-				if(enabled(TRAILING_COMMAS) && !wouldAccept(Tag.NAMED)) {
+				if(trailingCommas && !wouldAccept(Tag.NAMED)) {
 					break;
 				}
 				declarators.add(declarator = parseVariableDeclarator(type));
-				if(enabled(GETTERS_AND_SETTERS) && wouldAccept(LBRACE)) {
+				if(gettersAndSetters && wouldAccept(LBRACE)) {
 					members.addAll(parseGetterAndSetters(type, declarator));
 				}
 			}
@@ -2147,7 +2150,7 @@ public class JavaPlusPlusParser extends JavaParser {
 		}
 		var typeParameters = parseTypeParametersOpt();
 		Type returnType;
-		if(wouldAccept(GET.or(SET), LPAREN.or(ARROW).or(LBRACE).or(SEMI))) {
+		if(wouldAccept(GET_OR_SET, ACCESSOR_BODY_START)) {
 			if(wouldAccept(GET)) {
 				returnType = fieldType.clone();
 			} else {
@@ -2171,7 +2174,7 @@ public class JavaPlusPlusParser extends JavaParser {
     				modsAndAnnos.mods.add(createModifier("static"));
     			}
     			typeParameters = parseTypeParametersOpt();
-    			if(wouldAccept(GET.or(SET), LPAREN.or(ARROW).or(LBRACE).or(SEMI))) {
+    			if(wouldAccept(GET_OR_SET, ACCESSOR_BODY_START)) {
     				returnType = new VoidType();
     			} else if(accept(VOID)) {
     				returnType = new VoidType();
@@ -2193,7 +2196,7 @@ public class JavaPlusPlusParser extends JavaParser {
     				modsAndAnnos.mods.add(createModifier("static"));
     			}
     			typeParameters = parseTypeParametersOpt();
-    			if(wouldAccept(GET.or(SET), LPAREN.or(ARROW).or(LBRACE).or(SEMI))) {
+    			if(wouldAccept(GET_OR_SET, ACCESSOR_BODY_START)) {
     				returnType = new VoidType();
     			} else if(accept(VOID)) {
     				returnType = new VoidType();
@@ -2212,7 +2215,7 @@ public class JavaPlusPlusParser extends JavaParser {
     	    				modsAndAnnos.mods.add(createModifier("static"));
     	    			}
     	    			typeParameters = parseTypeParametersOpt();
-    	    			if(wouldAccept(GET.or(SET), LPAREN.or(ARROW).or(LBRACE).or(SEMI))) {
+    	    			if(wouldAccept(GET_OR_SET, ACCESSOR_BODY_START)) {
     	    				returnType = new VoidType();
     	    			} else if(accept(VOID)) {
 	        				returnType = new VoidType();
@@ -2342,10 +2345,11 @@ public class JavaPlusPlusParser extends JavaParser {
 		assert modsAndAnnos.canBeFieldMods();
 		var modifiers = modsAndAnnos.mods;
 		var annotations = modsAndAnnos.annos;
+		boolean trailingCommas = enabled(TRAILING_COMMAS);
 		var declarators = new ArrayList<VariableDeclarator>();
 		declarators.add(parseVariableDeclarator(type));
 		while(accept(COMMA)) {
-			if(enabled(TRAILING_COMMAS) && !wouldAccept(Tag.NAMED)) {
+			if(trailingCommas && !wouldAccept(Tag.NAMED)) {
 				break;
 			}
 			declarators.add(parseVariableDeclarator(type));
@@ -2372,7 +2376,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	
 	@Override
 	public void endStatement() {
-		if(enabled(IMPLICIT_SEMICOLONS) && (wouldAccept(RBRACE.or(ENDMARKER)) || tokens.look(-2).getType() == RBRACE)) {
+		if(enabled(IMPLICIT_SEMICOLONS) && (wouldAccept(RBRACE_OR_ENDMARKER) || tokens.look(-2).getType() == RBRACE)) {
 			accept(SEMI);
 		} else {
 			requireSemi();
@@ -2380,11 +2384,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	}
 	
 	protected Expression makeQualifier(String fullyQualifiedName) {
-		if(enabled(FULLY_QUALIFIED_NAMES)) {
-			return makeMemberAccess(fullyQualifiedName);
-		} else {
-			return new Variable(fullyQualifiedName.substring(fullyQualifiedName.lastIndexOf('.')+1));
-		}
+		return makeQualifier(QualifiedName(fullyQualifiedName));
 	}
 	
 	protected Expression makeQualifier(QualifiedName fullyQualifiedName) {
@@ -2403,17 +2403,14 @@ public class JavaPlusPlusParser extends JavaParser {
 		}
 	}
 	
+	private final Map<QualifiedName, ImportDecl> importDecls = new HashMap<>();
+	
+	protected void addImport(QualifiedName fullyQualifiedName) {
+		imports.add(importDecls.computeIfAbsent(fullyQualifiedName, ImportDecl::new));
+	}
+	
 	protected Expression makeImportedQualifier(String fullyQualifiedName) {
-		if(enabled(FULLY_QUALIFIED_NAMES) && !imported(fullyQualifiedName)) {
-			return makeMemberAccess(fullyQualifiedName);
-		} else {
-			if(importedNameOtherThan(fullyQualifiedName)) {
-				return makeMemberAccess(fullyQualifiedName);
-			} else {
-				imports.add(new ImportDecl(QualifiedName(fullyQualifiedName)));
-				return new Variable(fullyQualifiedName.substring(fullyQualifiedName.lastIndexOf('.')+1));
-			}
-		}
+		return makeImportedQualifier(QualifiedName(fullyQualifiedName));
 	}
 	
 	protected Expression makeImportedQualifier(QualifiedName fullyQualifiedName) {
@@ -2423,7 +2420,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			if(importedNameOtherThan(fullyQualifiedName)) {
 				return makeMemberAccess(fullyQualifiedName);
 			} else {
-				imports.add(new ImportDecl(fullyQualifiedName));
+				addImport(fullyQualifiedName);
 				return new Variable(fullyQualifiedName.lastName());
 			}
 		}
@@ -2436,16 +2433,21 @@ public class JavaPlusPlusParser extends JavaParser {
 			if(importedNameOtherThan(fullyQualifiedName)) {
 				return fullyQualifiedName;
 			} else {
-				imports.add(new ImportDecl(fullyQualifiedName));
+				addImport(fullyQualifiedName);
 				return fullyQualifiedName.lastName().toQualifiedName();
 			}
 		}
 	}
 	
+	@Override
+	protected boolean mayBeLambda() {
+		return super.mayBeLambda() || enabled(OPTIONAL_LITERALS) && wouldAccept(LPAREN, Tag.NAMED, QUES);
+	}
+	
 	@Override
 	public Type parseType(List<Annotation> annotations) {
 		var base = parseNonArrayType(annotations);
-		if(wouldAccept(AT.or(LBRACKET))) {
+		if(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			var dimensions = parseDimensions();
 			base.setAnnotations(emptyList());
 			Type type = new ArrayType(base, dimensions, annotations);
@@ -2456,7 +2458,7 @@ public class JavaPlusPlusParser extends JavaParser {
         			while(accept(QUES)) {
         				type = new GenericType(qualifier, List.of(type));
         			}
-        			if(wouldAccept(AT.or(LBRACKET))) {
+        			if(wouldAccept(ANNOTATION_OR_LBRACKET)) {
         				base.setAnnotations(emptyList());
         				dimensions = parseDimensions();
         				type = base = new ArrayType(type, dimensions, annotations);
@@ -2474,16 +2476,26 @@ public class JavaPlusPlusParser extends JavaParser {
 		}
 	}
 	
+	/**
+	 * @return the name of the primitive {@code Optional} class for the given primitive type,
+	 *         or {@code null} if there is none
+	 */
+	protected static QualifiedName primitiveOptionalName(JavaTokenType type) {
+		return switch(type) {
+			case INT -> QualNames.java_util_OptionalInt;
+			case LONG -> QualNames.java_util_OptionalLong;
+			case DOUBLE -> QualNames.java_util_OptionalDouble;
+			default -> null;
+		};
+	}
+	
 	@Override
 	public Type parseNonArrayType(List<Annotation> annotations) {
 		if(enabled(OPTIONAL_LITERALS)) {
 			Type type;
-			if(accept(INT, QUES)) {
-				type = new GenericType(makeImportedQualifiedName(QualNames.java_util_OptionalInt), emptyList(), annotations);
-			} else if(accept(DOUBLE, QUES)) {
-				type = new GenericType(makeImportedQualifiedName(QualNames.java_util_OptionalDouble), emptyList(), annotations);
-			} else if(accept(LONG, QUES)) {
-				type = new GenericType(makeImportedQualifiedName(QualNames.java_util_OptionalLong), emptyList(), annotations);
+			var primitiveOptional = primitiveOptionalName(token.getType());
+			if(primitiveOptional != null && accept(PRIMITIVE_TYPES, QUES)) {
+				type = new GenericType(makeImportedQualifiedName(primitiveOptional), emptyList(), annotations);
 			} else if(wouldAccept(PRIMITIVE_TYPES)) {
 				var name = token.getString();
 				nextToken();
@@ -2513,7 +2525,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			var dimensions = parseDimensions();
 			dimensions.add(0, dimension);
 			type = new ArrayType(base, dimensions, annotations);
-		} else if(wouldAccept(AT.or(LBRACKET))) {
+		} else if(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			var dimensions = parseDimensions();
 			base.setAnnotations(emptyList());
 			type = new ArrayType(base, dimensions, annotations);
@@ -2527,7 +2539,7 @@ public class JavaPlusPlusParser extends JavaParser {
     			while(accept(QUES)) {
     				type = new GenericType(qualifier, List.of(type));
     			}
-    			if(wouldAccept(AT.or(LBRACKET))) {
+    			if(wouldAccept(ANNOTATION_OR_LBRACKET)) {
     				base.setAnnotations(emptyList());
     				var dimensions = parseDimensions();
     				base = type = new ArrayType(type, dimensions, annotations);
@@ -2619,40 +2631,19 @@ public class JavaPlusPlusParser extends JavaParser {
 	
 	@Override
 	public Statement parseStatement() {
-		try(var $ = preStmts.enter()) {
-    		switch(token.getType()) {
-    			case WITH -> {
-    				if(enabled(WITH_STATEMENT)) {
-    					return preStmts.apply(parseWithStmt());
-    				}
-    			}
-    			case PRINT -> {
-    				if(enabled(PRINT_STATEMENT)) {
-    					return preStmts.apply(parsePrintStmt());
-    				}
-    			}
-    			case PRINTLN -> {
-    				if(enabled(PRINT_STATEMENT)) {
-    					return preStmts.apply(parsePrintlnStmt());
-    				}
-    			}
-    			case PRINTF -> {
-    				if(enabled(PRINT_STATEMENT)) {
-    					return preStmts.apply(parsePrintfStmt(false));
-    				}
-    			}
-    			case PRINTFLN -> {
-    				if(enabled(PRINT_STATEMENT)) {
-    					return preStmts.apply(parsePrintfStmt(true));
-    				}
-    			}
-    			case EXIT -> {
-    				if(enabled(EXIT_STATEMENT)) {
-    					return preStmts.apply(parseExitStmt());
-    				}
-    			}
-    			default -> {}
-    		}
+		Supplier<Statement> parser = switch(token.getType()) {
+			case WITH -> enabled(WITH_STATEMENT)? this::parseWithStmt : null;
+			case PRINT -> enabled(PRINT_STATEMENT)? this::parsePrintStmt : null;
+			case PRINTLN -> enabled(PRINT_STATEMENT)? this::parsePrintlnStmt : null;
+			case PRINTF -> enabled(PRINT_STATEMENT)? () -> parsePrintfStmt(false) : null;
+			case PRINTFLN -> enabled(PRINT_STATEMENT)? () -> parsePrintfStmt(true) : null;
+			case EXIT -> enabled(EXIT_STATEMENT)? this::parseExitStmt : null;
+			default -> null;
+		};
+		if(parser != null) {
+			try(var $ = preStmts.enter()) {
+				return preStmts.apply(parser.get());
+			}
 		}
 		return super.parseStatement();
 	}
@@ -2712,23 +2703,27 @@ public class JavaPlusPlusParser extends JavaParser {
 		} else {
 			var args = new ArrayList<Expression>();
 			args.add(parseExpression());
-			if(accept(COMMA)) {
-				do {
-					if(enabled(TRAILING_COMMAS) && wouldAccept(SEMI)) {
-						break;
-					}
-					args.add(parseExpression());
-				} while(accept(COMMA));
-			} else if(!wouldAccept(SEMI) && (!enabled(IMPLICIT_SEMICOLONS) || tokens.look(-2).getType() != RBRACE)) {
-				do {
-					args.add(parseExpression());
-				} while(!wouldAccept(SEMI) && (!enabled(IMPLICIT_SEMICOLONS) || tokens.look(-2).getType() != RBRACE));
-			}
-			endStatement();
+			parsePrintStmtArgsRest(args);
 			return args;
 		}
 	}
 	
+	protected void parsePrintStmtArgsRest(ArrayList<Expression> args) {
+		if(accept(COMMA)) {
+			do {
+				if(enabled(TRAILING_COMMAS) && wouldAccept(SEMI)) {
+					break;
+				}
+				args.add(parseExpression());
+			} while(accept(COMMA));
+		} else if(!wouldAccept(SEMI) && (!enabled(IMPLICIT_SEMICOLONS) || tokens.look(-2).getType() != RBRACE)) {
+			do {
+				args.add(parseExpression());
+			} while(!wouldAccept(SEMI) && (!enabled(IMPLICIT_SEMICOLONS) || tokens.look(-2).getType() != RBRACE));
+		}
+		endStatement();
+	}
+	
 	public Statement parsePrintfStmt(boolean isPrintfln) {
 		require(isPrintfln? PRINTFLN : PRINTF);
 		var qualifier = new MemberAccess(makeQualifier(java_lang_System), Names.out);
@@ -2743,19 +2738,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			format = new BinaryExpr(format, BinaryExpr.Op.PLUS, new Literal("%n"));
 		}
 		args.add(format);
-		if(accept(COMMA)) {
-			do {
-				if(enabled(TRAILING_COMMAS) && wouldAccept(SEMI)) {
-					break;
-				}
-				args.add(parseExpression());
-			} while(accept(COMMA));
-		} else if(!wouldAccept(SEMI) && (!enabled(IMPLICIT_SEMICOLONS) || tokens.look(-2).getType() != RBRACE)) {
-			do {
-				args.add(parseExpression());
-			} while(!wouldAccept(SEMI) && (!enabled(IMPLICIT_SEMICOLONS) || tokens.look(-2).getType() != RBRACE));
-		}
-		endStatement();
+		parsePrintStmtArgsRest(args);
 		return new ExpressionStmt(new FunctionCall(qualifier, Names.printf, args));
 	}
 	
@@ -2763,7 +2746,7 @@ public class JavaPlusPlusParser extends JavaParser {
 		require(EXIT);
 		var qualifier = makeQualifier(QualNames.java_lang_System);
 		Expression argument;
-		if(accept(SEMI) || enabled(IMPLICIT_SEMICOLONS) && wouldAccept(RBRACE.or(ENDMARKER))) {
+		if(accept(SEMI) || enabled(IMPLICIT_SEMICOLONS) && wouldAccept(RBRACE_OR_ENDMARKER)) {
 			argument = new Literal(0);
 		} else {
 			argument = parseExpression();
@@ -2795,7 +2778,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	}
 	
 	public ResourceSpecifier parseWithResource(boolean inParens, int count) {
-		if(wouldAccept(AT.or(Tag.NAMED).or(Tag.PRIMITIVE_TYPE).or(Tag.LOCAL_VAR_MODIFIER))) {
+		if(wouldAccept(LOCAL_VAR_START)) {
     	vardecl:
     		try(var state = tokens.enter()) {
 				var modsAndAnnos = parseFinalAndAnnotations();
@@ -2939,7 +2922,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			}
 		}
 		
-		boolean mayHaveVariable = wouldAccept(AT.or(Tag.NAMED).or(Tag.PRIMITIVE_TYPE).or(Tag.LOCAL_VAR_MODIFIER));
+		boolean mayHaveVariable = wouldAccept(LOCAL_VAR_START);
 		if(mayHaveVariable) {
 			foreach: 
 			try(var state = tokens.enter()) {
@@ -3209,7 +3192,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	@Override
 	public ReturnStmt parseReturnStmt() {
 		require(RETURN);
-		if(accept(SEMI) || enabled(IMPLICIT_SEMICOLONS) && wouldAccept(RBRACE.or(ENDMARKER))) {
+		if(accept(SEMI) || enabled(IMPLICIT_SEMICOLONS) && wouldAccept(RBRACE_OR_ENDMARKER)) {
 			return new ReturnStmt();
 		} else {
 			var expr = parseExpression();
@@ -3220,10 +3203,11 @@ public class JavaPlusPlusParser extends JavaParser {
 
 	@Override
 	public ArrayList<GenericType> parseGenericTypeList() {
+		boolean trailingCommas = enabled(TRAILING_COMMAS);
 		var types = new ArrayList<GenericType>();
 		types.add(parseGenericType());
 		while(accept(COMMA)) {
-			if(enabled(TRAILING_COMMAS) && !wouldAccept(Tag.NAMED)) {
+			if(trailingCommas && !wouldAccept(Tag.NAMED)) {
 				break;
 			}
 			types.add(parseGenericType());
@@ -3253,7 +3237,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	
 	@Override
 	public Initializer parseVariableInitializer(Type type, ArrayList<Dimension> dimensions) {
-		if(enabled(SIZED_ARRAY_INITIALIZER) && dimensions.isEmpty() && wouldAccept(AT.or(LBRACKET))) {
+		if(enabled(SIZED_ARRAY_INITIALIZER) && dimensions.isEmpty() && wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			var sizes = new ArrayList<Size>();
 			var newdimensions = new ArrayList<Dimension>();
 			var annotations = parseAnnotations();
@@ -3261,7 +3245,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			dimensions.add(new Dimension(Node.clone(annotations)));
 			sizes.add(new Size(parseExpression(), annotations));
 			require(RBRACKET);
-			while(wouldAccept(AT.or(LBRACKET))) {
+			while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 				annotations = parseAnnotations();
 				require(LBRACKET);
 				dimensions.add(new Dimension(Node.clone(annotations)));
@@ -3273,7 +3257,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					require(RBRACKET);
 				}
 			}
-			while(wouldAccept(AT.or(LBRACKET))) {
+			while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 				annotations = parseAnnotations();
 				require(LBRACKET, RBRACKET);
 				dimensions.add(new Dimension(Node.clone(annotations)));
@@ -3313,7 +3297,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	public Optional<? extends Initializer> parseVariableInitializerOpt(Type type, ArrayList<Dimension> dimensions) {
 		if(accept(EQ)) {
 			return Optional.of(parseInitializer(dimensionCount(type, dimensions)));
-		} else if(enabled(SIZED_ARRAY_INITIALIZER) && dimensions.isEmpty() && wouldAccept(AT.or(LBRACKET))) {
+		} else if(enabled(SIZED_ARRAY_INITIALIZER) && dimensions.isEmpty() && wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			var sizes = new ArrayList<Size>();
 			var newdimensions = new ArrayList<Dimension>();
 			var annotations = parseAnnotations();
@@ -3321,7 +3305,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			dimensions.add(new Dimension(Node.clone(annotations)));
 			sizes.add(new Size(parseExpression(), annotations));
 			require(RBRACKET);
-			while(wouldAccept(AT.or(LBRACKET))) {
+			while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 				annotations = parseAnnotations();
 				require(LBRACKET);
 				dimensions.add(new Dimension(Node.clone(annotations)));
@@ -3333,7 +3317,7 @@ public class JavaPlusPlusParser extends JavaParser {
 					require(RBRACKET);
 				}
 			}
-			while(wouldAccept(AT.or(LBRACKET))) {
+			while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 				annotations = parseAnnotations();
 				require(LBRACKET, RBRACKET);
 				dimensions.add(new Dimension(Node.clone(annotations)));
@@ -3371,7 +3355,7 @@ public class JavaPlusPlusParser extends JavaParser {
 	@Override
 	public ArrayList<Dimension> parseDimensions() {
 		var dimensions = new ArrayList<Dimension>();
-		while(wouldAccept(AT.or(LBRACKET))) {
+		while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			if(wouldAccept(AT)) {
 				try(var state = tokens.enter()) {
 					var annotations = parseAnnotations();
@@ -3433,36 +3417,27 @@ public class JavaPlusPlusParser extends JavaParser {
 		}
 		if(accept(QUES)) {
 			if(enabled(OPTIONAL_LITERALS)) {
-				try(var state = tokens.enter()) {
-    				if(accept(LT)) {
-    					var annotations = parseAnnotations();
-    					if(accept(INT, GT)) {
-    						var qualifier = makeImportedQualifier(QualNames.java_util_OptionalInt);
-    						return new FunctionCall(qualifier, Names.of, expr);
-    					} else if(accept(LONG, GT)) {
-    						var qualifier = makeImportedQualifier(QualNames.java_util_OptionalLong);
-    						return new FunctionCall(qualifier, Names.of, expr);
-    					} else if(accept(DOUBLE, GT)) {
-    						var qualifier = makeImportedQualifier(QualNames.java_util_OptionalDouble);
-    						return new FunctionCall(qualifier, Names.of, expr);
-    					} else {
-    						var type = parseTypeArgument(annotations);
-    						require(GT);
-    						var qualifier = makeImportedQualifier(QualNames.java_util_Optional);
-    						boolean hasNonNullAnnotation = false;
-    						for(var annotation : annotations) {
-    							if(annotation.getType().getName().endsWith(Names.NonNull)) {
-    								hasNonNullAnnotation = true;
-    							}
-    						}
-    						return new FunctionCall(qualifier, hasNonNullAnnotation? Names.of : Names.ofNullable, List.of(type), expr);
-    					}
-    				} else if(wouldAccept(RPAREN.or(RBRACE).or(RBRACKET).or(COMMA).or(SEMI))) {
-    					var qualifier = makeImportedQualifier(QualNames.java_util_Optional);
-    					return new FunctionCall(qualifier, Names.ofNullable, expr);
-    				} else {
-    					state.reset();
-    				}
+				if(accept(LT)) {
+					var annotations = parseAnnotations();
+					var primitiveOptional = primitiveOptionalName(token.getType());
+					if(primitiveOptional != null && accept(PRIMITIVE_TYPES, GT)) {
+						var qualifier = makeImportedQualifier(primitiveOptional);
+						return new FunctionCall(qualifier, Names.of, expr);
+					} else {
+						var type = parseTypeArgument(annotations);
+						require(GT);
+						var qualifier = makeImportedQualifier(QualNames.java_util_Optional);
+						boolean hasNonNullAnnotation = false;
+						for(var annotation : annotations) {
+							if(annotation.getType().getName().endsWith(Names.NonNull)) {
+								hasNonNullAnnotation = true;
+							}
+						}
+						return new FunctionCall(qualifier, hasNonNullAnnotation? Names.of : Names.ofNullable, List.of(type), expr);
+					}
+				} else if(wouldAccept(OPTIONAL_LITERAL_FOLLOW)) {
+					var qualifier = makeImportedQualifier(QualNames.java_util_Optional);
+					return new FunctionCall(qualifier, Names.ofNullable, expr);
 				}
 			}
 			var truepart = parseExpression();
@@ -3589,7 +3564,7 @@ public class JavaPlusPlusParser extends JavaParser {
 		try(var $ = scope.enter(Scope.NORMAL)) {
 			require(LPAREN);
 			Expression expr;
-			if(enabled(VARDECL_EXPRESSIONS) && wouldAccept(AT.or(Tag.LOCAL_VAR_MODIFIER).or(Tag.NAMED).or(Tag.PRIMITIVE_TYPE))) {
+			if(enabled(VARDECL_EXPRESSIONS) && wouldAccept(LOCAL_VAR_START)) {
 				expr = null;
 			vardecl:
 				try(var state = tokens.enter()) {
@@ -3670,10 +3645,11 @@ public class JavaPlusPlusParser extends JavaParser {
 				return emptyList();
 			}
 		} else {
+			boolean trailingCommas = enabled(TRAILING_COMMAS);
 			var args = new ArrayList<Expression>();
 			args.add(parseExpression());
 			while(accept(COMMA)) {
-				if(enabled(TRAILING_COMMAS) && wouldAccept(RPAREN)) {
+				if(trailingCommas && wouldAccept(RPAREN)) {
 					break;
 				}
 				args.add(parseExpression());
@@ -3705,13 +3681,13 @@ public class JavaPlusPlusParser extends JavaParser {
 			if(wouldAccept(COLCOL)) {
 				expr = parseMethodReferenceRest(expr);
 			} else if(wouldAccept(DOT)
-					&& (!wouldAccept(DOT, SUPER.or(THIS)) || wouldAccept(DOT, SUPER.or(THIS), not(LPAREN.or(SEMI))))) {
+					&& (!wouldAccept(DOT, SUPER_OR_THIS) || wouldAccept(DOT, SUPER_OR_THIS, NOT_LPAREN_OR_SEMI))) {
 				List<? extends TypeArgument> typeArguments;
 				if(wouldAccept(DOT, LT)) {
 					try(var state = tokens.enter()) {
 						require(DOT);
 						typeArguments = parseTypeArguments();
-						if(wouldAccept(SUPER.or(THIS), LPAREN)) {
+						if(wouldAccept(SUPER_OR_THIS, LPAREN)) {
 							state.reset();
 							return expr;
 						}
@@ -3997,14 +3973,9 @@ public class JavaPlusPlusParser extends JavaParser {
 			require(QUES);
 			if(accept(LT)) {
 				var annotations = parseAnnotations();
-				if(accept(INT, GT)) {
-					var qualifier = makeImportedQualifier(QualNames.java_util_OptionalInt);
-					return new FunctionCall(qualifier, Names.empty);
-				} else if(accept(LONG, GT)) {
-					var qualifier = makeImportedQualifier(QualNames.java_util_OptionalLong);
-					return new FunctionCall(qualifier, Names.empty);
-				} else if(accept(DOUBLE, GT)) {
-					var qualifier = makeImportedQualifier(QualNames.java_util_OptionalDouble);
+				var primitiveOptional = primitiveOptionalName(token.getType());
+				if(primitiveOptional != null && accept(PRIMITIVE_TYPES, GT)) {
+					var qualifier = makeImportedQualifier(primitiveOptional);
 					return new FunctionCall(qualifier, Names.empty);
 				} else {
 					var type = parseTypeArgument(annotations);
@@ -4021,13 +3992,15 @@ public class JavaPlusPlusParser extends JavaParser {
 		}
 	}
 	
+	private static final Pattern parameterIndexRegex = Pattern.compile("\\d+(_+\\d+)*");
+	
 	public Expression parseParameterLiteral() {
 		if(functionParameters.isEmpty() || !enabled(PARAMETER_LITERALS)) {
 			throw syntaxError("invalid start of expression");
 		} else {
 			require(HASHTAG);
 			var parameters = functionParameters.current();
-			if(!wouldAccept(NUMBER) || !token.getString().matches("\\d+(_+\\d+)*")) {
+			if(!wouldAccept(NUMBER) || !parameterIndexRegex.matcher(token.getString()).matches()) {
 				throw syntaxError("Expected argument index after #, got " + token);
 			}
 			var argIndex = Integer.parseUnsignedInt(token.getString().replace("_", ""));
@@ -4078,6 +4051,8 @@ public class JavaPlusPlusParser extends JavaParser {
 		};
 	}
 	
+	private static final Pattern leadingZerosRegex = Pattern.compile("(?<=^[-+]?)(0(?!$))+");
+	
 	@Override
 	public Expression parseNumberLiteral() {
 		var token = this.token;
@@ -4130,7 +4105,7 @@ public class JavaPlusPlusParser extends JavaParser {
 							default -> repr = "0" + repr.substring(2);
 						}
 					} else if(str.length() > 1 && hasNumPrefix(str, "0")) {
-						repr = repr.replaceFirst("(?<=^[-+]?)(0(?!$))+", "");
+						repr = leadingZerosRegex.matcher(repr).replaceFirst("");
 					}
 				} else if(str.length() > 1 && str.startsWith("0")) {
 					base = 8;
@@ -4161,6 +4136,34 @@ public class JavaPlusPlusParser extends JavaParser {
 		}
 	}
 	
+	/**
+	 * Parses the comma-separated expressions following the first element of a collection literal,
+	 * allowing a trailing comma before {@code end}.
+	 */
+	protected void parseCollectionElementsRest(ArrayList<Expression> elements, JavaTokenType end) {
+		while(accept(COMMA)) {
+			if(wouldAccept(end)) {
+				break;
+			}
+			elements.add(parseExpression());
+		}
+	}
+	
+	/**
+	 * Parses the comma-separated {@code key: value} entries following the first entry of a map literal,
+	 * allowing a trailing comma before the closing brace.
+	 */
+	protected void parseMapEntriesRest(ArrayList<Pair<Expression,Expression>> pairs) {
+		while(accept(COMMA)) {
+			if(wouldAccept(RBRACE)) {
+				break;
+			}
+			var key = parseExpression();
+			require(COLON);
+			pairs.add(Pair.of(key, parseExpression()));
+		}
+	}
+	
 	protected Expression makeListCall(List<Expression> elements) {
 		return new FunctionCall(makeImportedQualifier(QualNames.java_util_List), Names.of, elements);
 	}
@@ -4174,12 +4177,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			if(!wouldAccept(RBRACKET)) {
 				try(var $ = scope.enter(Scope.NORMAL)) {
     				elements.add(parseExpression());
-    				while(accept(COMMA)) {
-    					if(wouldAccept(RBRACKET)) {
-    						break;
-    					}
-    					elements.add(parseExpression());
-    				}
+    				parseCollectionElementsRest(elements, RBRACKET);
 				}
 			}
 			
@@ -4195,9 +4193,16 @@ public class JavaPlusPlusParser extends JavaParser {
 		return new FunctionCall(makeImportedQualifier(QualNames.java_util_Set), Names.of, elements);
 	}
 	
+	/**
+	 * The largest number of entries accepted by the {@code Map.of} overloads.
+	 */
+	private static final int MAX_MAP_OF_ENTRIES = 10;
+	
 	protected Expression makeMapCall(List<Pair<Expression, Expression>> pairs) {
 		var qualifier = makeImportedQualifier(QualNames.java_util_Map);
-		if(pairs.size() <= 10) {
+		if(pairs.isEmpty()) {
+			return new FunctionCall(qualifier, Names.of);
+		} else if(pairs.size() <= MAX_MAP_OF_ENTRIES) {
 			var args = new ArrayList<Expression>(pairs.size()*2);
 			for(var pair : pairs) {
 				args.add(pair.getLeft());
@@ -4205,67 +4210,61 @@ public class JavaPlusPlusParser extends JavaParser {
 			}
 			return new FunctionCall(qualifier, Names.of, args);
 		} else {
-			return new FunctionCall(qualifier, Names.ofEntries, pairs.stream().map(pair -> new FunctionCall(qualifier, Names.entry, pair.getLeft(), pair.getRight())).collect(Collectors.toList()));
+			var entries = new ArrayList<Expression>(pairs.size());
+			for(var pair : pairs) {
+				entries.add(new FunctionCall(qualifier, Names.entry, pair.getLeft(), pair.getRight()));
+			}
+			return new FunctionCall(qualifier, Names.ofEntries, entries);
 		}
 	}
 	
 	protected Expression parseMapOrSetLiteral() {
 		if(enabled(COLLECTION_LITERALS)) {
 			require(LBRACE);
-			
-			if(accept(RBRACE)) {
-				return makeMapCall(emptyList());
-			} else {
-				Expression expr;
-				try(var $ = scope.enter(Scope.NORMAL)) {
-					expr = parseExpression();
-				}
-				if(accept(COLON)) {
-					var pairs = new ArrayList<Pair<Expression,Expression>>();
-					try(var $ = scope.enter(Scope.NORMAL)) {
-    					pairs.add(Pair.of(expr, parseExpression()));
-    					while(accept(COMMA)) {
-    						if(wouldAccept(RBRACE)) {
-    							break;
-    						}
-    						expr = parseExpression();
-    						require(COLON);
-    						pairs.add(Pair.of(expr, parseExpression()));
-    					}
-					}
-					require(RBRACE);
-					return makeMapCall(pairs);
-				} else {
-					var elements = new ArrayList<Expression>();
-					elements.add(expr);
-					try(var $ = scope.enter(Scope.NORMAL)) {
-    					while(accept(COMMA)) {
-    						if(wouldAccept(RBRACE)) {
-    							break;
-    						}
-    						elements.add(parseExpression());
-    					}
-					}
-					require(RBRACE);
-					return makeSetCall(elements);
-				}
+			try(var $ = scope.enter(Scope.NORMAL)) {
+				return parseBraceCollectionRest(this::makeSetCall);
 			}
 		} else {
 			throw syntaxError("invalid start of expression");
 		}
 	}
 
+	/**
+	 * Parses the contents of a brace-enclosed collection literal after the opening brace.
+	 * If the first element is followed by a colon, the contents are parsed as map entries,
+	 * otherwise the elements are passed to {@code makeElementsCall}.
+	 */
+	protected Expression parseBraceCollectionRest(Function<List<Expression>,Expression> makeElementsCall) {
+		if(accept(RBRACE)) {
+			return makeMapCall(emptyList());
+		}
+		var expr = parseExpression();
+		if(accept(COLON)) {
+			var pairs = new ArrayList<Pair<Expression,Expression>>();
+			pairs.add(Pair.of(expr, parseExpression()));
+			parseMapEntriesRest(pairs);
+			require(RBRACE);
+			return makeMapCall(pairs);
+		} else {
+			var elements = new ArrayList<Expression>();
+			elements.add(expr);
+			parseCollectionElementsRest(elements, RBRACE);
+			require(RBRACE);
+			return makeElementsCall.apply(elements);
+		}
+	}
+
 	protected Expression makeFStringExpression(String format, List<Expression> args, boolean isRaw) {
 		if(args.isEmpty() && format.indexOf('%') == -1) {
 			try {
-				return new Literal(isRaw? format : StringEscapeUtils.unescapeJava(format));
+				return new Literal(isRaw? format : unescapeJava(format));
 			} catch(Exception e) {
     			throw new SyntaxError("invalid string literal", filename, token.getStart().getLine(), token.getStart().getColumn(), token.getLine());
     		}
 		} else {
 			var qualifier = makeQualifier(QualNames.java_lang_String);
 			try {
-				args.add(0, new Literal(isRaw? format : StringEscapeUtils.unescapeJava(format)));
+				args.add(0, new Literal(isRaw? format : unescapeJava(format)));
 			} catch(Exception e) {
     			var error = new SyntaxError("invalid string literal", filename, token.getStart().getLine(), token.getStart().getColumn(), token.getLine());
     			error.addSuppressed(e);
@@ -4278,15 +4277,17 @@ public class JavaPlusPlusParser extends JavaParser {
 	private static final Pattern formatFlagsRegex = Pattern.compile("^(?<flags>[-+# 0,(]{0,7})([1-9]\\d*)?(\\.\\d+)?([bBhHsScCdoxXeEfgGaA%n]|[tT][HIklMSLNpzZsQBbhAaCYyjmdeRTrDFc])");
 	private static final Set<Character> formatFlags = Set.of('+', '-', '#', ' ', '0', '(', ',');
 	
-	private static final Pattern rawStringRegex = Pattern.compile("^[fF]?[rR]");
+	private static final Pattern newlineRegex = Pattern.compile("\r?\n");
 	
 	@Override
 	public Expression parseStringLiteral() {
 		var startToken = this.token;
 		var str = startToken.getString();
 		require(STRING);
-		if(enabled(RAW_STRING_LITERALS) && rawStringRegex.matcher(str).find()) {
-			if(str.startsWith("f") || str.startsWith("F") || "fF".indexOf(str.charAt(1)) >= 0) {
+		char first = str.charAt(0);
+		boolean formatPrefix = first == 'f' || first == 'F';
+		if(enabled(RAW_STRING_LITERALS) && (first == 'r' || first == 'R' || formatPrefix && str.length() > 1 && "rR".indexOf(str.charAt(1)) >= 0)) {
+			if(formatPrefix || "fF".indexOf(str.charAt(1)) >= 0) {
 				if(enabled(FORMAT_STRINGS)) {
 					return parseFormatStringLiteral(startToken, str);
 				} else {
@@ -4308,9 +4309,9 @@ public class JavaPlusPlusParser extends JavaParser {
         			throw syntaxError("invalid string literal", startToken);
         		}
 			}
-		} else if(enabled(FORMAT_STRINGS) && (str.startsWith("f") || str.startsWith("F"))) {
+		} else if(enabled(FORMAT_STRINGS) && formatPrefix) {
 			return parseFormatStringLiteral(startToken, str);
-		} else if(enabled(REGEX_LITERALS) && str.startsWith("/")) {
+		} else if(enabled(REGEX_LITERALS) && first == '/') {
 			return parseRegexLiteral(startToken, str);
 		} else {
 			if(!str.startsWith("\"")) {
@@ -4320,7 +4321,7 @@ public class JavaPlusPlusParser extends JavaParser {
 				if(enabled(TEXT_BLOCKS)) {
 					str = str.substring(3, str.length()-3).replace("\r\n", "\\n").replace("\n", "\\n");
 					try {
-						return new Literal(StringEscapeUtils.unescapeJava(str));
+						return new Literal(unescapeJava(str));
 					} catch(Exception e) {
 						throw syntaxError("invalid string literal", startToken);
 					}
@@ -4330,7 +4331,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			} else {
 				str = str.substring(1, str.length()-1);
 				try {
-	    			return new Literal(StringEscapeUtils.unescapeJava(str), startToken.getString());
+	    			return new Literal(unescapeJava(str), startToken.getString());
 	    		} catch(Exception e) {
 	    			throw syntaxError("invalid string literal", startToken);
 	    		}
@@ -4339,23 +4340,29 @@ public class JavaPlusPlusParser extends JavaParser {
 	}
 	
 	protected Expression parseRegexLiteral(Token<JavaTokenType> startToken, String str) {
-		var sb = new StringBuilder();
-		boolean escape = false;
-		for(int i = 1; i < str.length() - 1; i++) {
-			char c = str.charAt(i);
-			if(escape) {
-				if(c != '/') {
-					sb.append('\\');
-				}
-				sb.append(c);
-				escape = false;
-			} else if(c == '\\') {
-				escape = true;
-			} else {
-				sb.append(c);
+		int firstEscape = str.indexOf('\\', 1);
+		if(firstEscape < 0 || firstEscape >= str.length() - 1) {
+			str = str.substring(1, str.length() - 1);
+		} else {
+			var sb = new StringBuilder(str.length());
+			sb.append(str, 1, firstEscape);
+			boolean escape = false;
+			for(int i = firstEscape; i < str.length() - 1; i++) {
+				char c = str.charAt(i);
+				if(escape) {
+					if(c != '/') {
+						sb.append('\\');
+					}
+					sb.append(c);
+					escape = false;
+				} else if(c == '\\') {
+					escape = true;
+				} else {
+					sb.append(c);
+				}
 			}
+			str = sb.toString();
 		}
-		str = sb.toString();
 		Literal literal;
 		try {
 			literal = new Literal(str);
@@ -4373,7 +4380,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			if(!enabled(TEXT_BLOCKS)) {
 				throw syntaxError("invalid string literal", startToken);
 			}
-			format = str.substring(isRaw? 5 : 4, str.length()-3).replace("%", "%%").replaceAll("\r?\n", "%n");
+			format = newlineRegex.matcher(str.substring(isRaw? 5 : 4, str.length()-3).replace("%", "%%")).replaceAll("%n");
 		} else if(str.endsWith("\"")) {
 			format = str.substring(isRaw? 3 : 2, str.length()-1).replace("%", "%%");
 		} else {
@@ -4445,7 +4452,7 @@ public class JavaPlusPlusParser extends JavaParser {
 			}
 			format = formatBuilder.toString();
 			if(isMultiline) {
-				format = format.replaceAll("\r?\n", "%n");
+				format = newlineRegex.matcher(format).replaceAll("%n");
 			}
 		}
 		return makeFStringExpression(format, args, false);
@@ -4513,38 +4520,8 @@ public class JavaPlusPlusParser extends JavaParser {
 	public ClassCreator parseClassCreatorRest(List<? extends TypeArgument> typeArguments, GenericType type) {
 		boolean hasDiamond = type.getTypeArguments().isEmpty() && accept(LT, GT);
 		if(enabled(COLLECTION_LITERALS) && wouldAccept(LBRACE) && scope.current() != Scope.CONDITION) {
-			Expression arg;
 			require(LBRACE);
-			if(accept(RBRACE)) {
-				arg = makeMapCall(emptyList());
-			} else {
-				var expr = parseExpression();
-				if(accept(COLON)) {
-					var pairs = new ArrayList<Pair<Expression,Expression>>();
-					pairs.add(Pair.of(expr, parseExpression()));
-					while(accept(COMMA)) {
-						if(wouldAccept(RBRACE)) {
-							break;
-						}
-						expr = parseExpression();
-						require(COLON);
-						pairs.add(Pair.of(expr, parseExpression()));
-					}
-					require(RBRACE);
-					arg = makeMapCall(pairs);
-				} else {
-					var elements = new ArrayList<Expression>();
-					elements.add(expr);
-					while(accept(COMMA)) {
-						if(wouldAccept(RBRACE)) {
-							break;
-						}
-						elements.add(parseExpression());
-					}
-					require(RBRACE);
-					arg = makeListCall(elements);
-				}
-			}
+			var arg = parseBraceCollectionRest(this::makeListCall);
 			return new ClassCreator(typeArguments, type, hasDiamond, arg);
 		}
 		var args = enabled(OPTIONAL_CONSTRUCTOR_ARGUMENTS)? parseArgumentsOpt(true) : parseArguments(true);
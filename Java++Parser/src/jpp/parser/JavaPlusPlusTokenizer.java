@@ -65,40 +65,11 @@ public class JavaPlusPlusTokenizer extends JavaTokenizer<JavaTokenType> {
 	}
 	
 	protected void setEnabled(String featureId, boolean enabled) {
-		if(featureId.equals("*")) {
-			if(enabled) {
-				enabledFeatures.addAll(Feature.VALUES);
-			} else {
-				enabledFeatures.clear();
-			}
-		} else if(featureId.endsWith(".*") && featureId.length() > 2) {
-			String prefix = featureId.substring(0, featureId.length()-1); // removes the *
-			boolean found = false;
-			for(var feature : Feature.VALUES) {
-				if(feature.id.startsWith(prefix)) {
-					found = true;
-					if(enabled) {
-						enabledFeatures.add(feature);
-					} else {
-						enabledFeatures.remove(feature);
-					}
-				}
-			}
-			if(!found) {
-				throw new IllegalArgumentException("No feature found matching '" + featureId + "'");
-			}
+		var features = Feature.fromPattern(featureId);
+		if(enabled) {
+			enabledFeatures.addAll(features);
 		} else {
-			for(var feature : Feature.VALUES) {
-				if(feature.id.equals(featureId)) {
-					if(enabled) {
-						enabledFeatures.add(feature);
-					} else {
-						enabledFeatures.remove(feature);
-					}
-					return;
-				}
-			}
-			throw new IllegalArgumentException("No feature found matching '" + featureId + "'");
+			enabledFeatures.removeAll(features);
 		}
 	}
 	
@@ -1,14 +1,14 @@
 package jpp.parser;
 
 
-import java.util.HashMap;
+import java.util.concurrent.ConcurrentHashMap;
 
 import jtree.nodes.Name;
 import lombok.experimental.UtilityClass;
 
 @UtilityClass
 public class Names {
-	private static final HashMap<String,Name> normalNameMap = new HashMap<>();
+	private static final ConcurrentHashMap<String,Name> normalNameMap = new ConcurrentHashMap<>();
 	
 	public static final Name // @formatter:off
                 of = Name("of"),
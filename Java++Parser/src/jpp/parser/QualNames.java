@@ -1,13 +1,13 @@
 package jpp.parser;
 
-import java.util.HashMap;
+import java.util.concurrent.ConcurrentHashMap;
 
 import jtree.nodes.QualifiedName;
 import lombok.experimental.UtilityClass;
 
 @UtilityClass
 public class QualNames {
-	private static final HashMap<String,QualifiedName> qualNameMap = new HashMap<>();
+	private static final ConcurrentHashMap<String,QualifiedName> qualNameMap = new ConcurrentHashMap<>();
 	
 	public static final QualifiedName // @formatter:off
         java_util_Optional = QualifiedName("java.util.Optional"),
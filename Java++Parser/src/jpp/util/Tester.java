@@ -4,6 +4,7 @@ import java.util.Arrays;
 import java.util.Collection;
 import java.util.EnumSet;
 import java.util.List;
+import java.util.Set;
 import java.util.stream.Collectors;
 
 import jpp.nodes.EnableDisableStmt;
@@ -43,7 +44,7 @@ public class Tester extends jtree.parser.Tester {
 	
 	protected void printFeatures() {
 		System.out.println("Features:");
-		for(var feature : Feature.VALUES.stream().sorted((feature1, feature2) -> feature1.id.compareTo(feature2.id)).collect(Collectors.toList())) {
+		for(var feature : Feature.VALUES_BY_ID) {
 			System.out.println(feature.id);
 		}
 	}
@@ -54,8 +55,10 @@ public class Tester extends jtree.parser.Tester {
 				System.out.println("All features are currently disabled");
 			} else {
 				System.out.println("Enabled features:");
-				for(var feature : enabledFeatures.stream().sorted((feature1, feature2) -> feature1.id.compareTo(feature2.id)).collect(Collectors.toList())) {
-					System.out.println(feature.id);
+				for(var feature : Feature.VALUES_BY_ID) {
+					if(enabledFeatures.contains(feature)) {
+						System.out.println(feature.id);
+					}
 				}
 			}
 		} else {
@@ -69,8 +72,10 @@ public class Tester extends jtree.parser.Tester {
 				System.out.print("All features are currently enabled");
 			} else {
 				System.out.println("Disabled features:");
-				for(var feature : EnumSet.complementOf(enabledFeatures).stream().sorted((feature1, feature2) -> feature1.id.compareTo(feature2.id)).collect(Collectors.toList())) {
-					System.out.println(feature.id);
+				for(var feature : Feature.VALUES_BY_ID) {
+					if(!enabledFeatures.contains(feature)) {
+						System.out.println(feature.id);
+					}
 				}
 			}
 		} else {
@@ -83,7 +88,6 @@ public class Tester extends jtree.parser.Tester {
 	}
 	
 	protected void setEnabled(Collection<String> features, boolean enabled) {
-		outer:
 		for(String featureId : features) {
 			if(featureId.equals("*")) {
 				if(enabled) {
@@ -93,42 +97,25 @@ public class Tester extends jtree.parser.Tester {
 					enabledFeatures.clear();
 					System.out.println("Disabled all features");
 				}
-			} else if(featureId.endsWith(".*") && featureId.length() > 2) {
-				String prefix = featureId.substring(0, featureId.length()-1); // removes the *
-				boolean found = false;
-				for(var feature : Feature.VALUES) {
-					if(feature.id.startsWith(prefix)) {
-						found = true;
-						if(enabled) {
-							if(enabledFeatures.add(feature)) {
-								System.out.println("Enabled " + feature.id);
-							}
-						} else {
-							if(enabledFeatures.remove(feature)) {
-								System.out.println("Disabled " + feature.id);
-							}
-						}
-					}
-				}
-				if(!found) {
-					System.out.println("No feature found matching '" + featureId + "'");
-				}
 			} else {
-				for(var feature : Feature.VALUES) {
-					if(feature.id.equals(featureId)) {
-						if(enabled) {
-							if(enabledFeatures.add(feature)) {
-								System.out.println("Enabled " + feature.id);
-							}
-						} else {
-							if(enabledFeatures.remove(feature)) {
-								System.out.println("Disabled " + feature.id);
-							}
+				Set<Feature> matched;
+				try {
+					matched = Feature.fromPattern(featureId);
+				} catch(IllegalArgumentException e) {
+					System.out.println(e.getMessage());
+					continue;
+				}
+				for(var feature : matched) {
+					if(enabled) {
+						if(enabledFeatures.add(feature)) {
+							System.out.println("Enabled " + feature.id);
+						}
+					} else {
+						if(enabledFeatures.remove(feature)) {
+							System.out.println("Disabled " + feature.id);
 						}
-						continue outer;
 					}
 				}
-				System.out.println("No feature found matching '" + featureId + "'");
 			}
 		}
 	}
@@ -1,10 +1,21 @@
 package jtree.nodes;
 
+import java.io.IOException;
 import java.util.function.Consumer;
 
 public interface INode {
 	String toCode();
 	
+	/**
+	 * Writes the result of {@link #toCode()} to the given output. Nodes with
+	 * large bodies may override this to emit their code piece by piece.
+	 * 
+	 * @param out the output to write to
+	 */
+	default void writeCode(Appendable out) throws IOException {
+		out.append(toCode());
+	}
+	
 	INode clone();
 	
 	/**
@@ -3,6 +3,7 @@ package jtree.nodes;
 import static jtree.util.Utils.*;
 import static lombok.AccessLevel.*;
 
+import java.io.IOException;
 import java.util.List;
 import java.util.Optional;
 import java.util.function.Consumer;
@@ -73,6 +74,29 @@ public class NormalCompilationUnit extends CompilationUnit {
 				+ joinNodes("\n\n", getDeclarations())).stripTrailing();
 	}
 	
+	@Override
+	public void writeCode(Appendable out) throws IOException {
+		var declarations = getDeclarations();
+		var codes = new String[declarations.size()];
+		int last = -1;
+		for(int i = 0; i < codes.length; i++) {
+			codes[i] = declarations.get(i).toCode();
+			if(!codes[i].isBlank()) {
+				last = i;
+			}
+		}
+		var prefix = getPackage().map(pckg -> pckg.toCode() + "\n").orElse("") + importString();
+		if(last == -1) {
+			out.append(prefix.stripTrailing());
+			return;
+		}
+		out.append(prefix);
+		for(int i = 0; i < last; i++) {
+			out.append(codes[i]).append("\n\n");
+		}
+		out.append(codes[last].stripTrailing());
+	}
+	
 	public Optional<PackageDecl> getPackage() {
 		return _package;
 	}
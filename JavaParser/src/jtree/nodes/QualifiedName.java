@@ -18,7 +18,7 @@ public final class QualifiedName extends Node implements Iterable<Name>, CharSeq
 	private final Name[] names;
 	private final String stringValue;
 	@Getter(lazy = true) @Accessors(fluent = true)
-	private final int hashCode = Objects.hash(names, stringValue);
+	private final int hashCode = Objects.hash(Arrays.hashCode(names), stringValue);
 
 	/**
 	 * @param string the qualified name
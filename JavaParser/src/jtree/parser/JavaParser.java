@@ -92,9 +92,11 @@ import static jtree.parser.JavaTokenType.WITH;
 import static jtree.parser.JavaTokenType.YIELD;
 import static jtree.util.Utils.emptyList;
 import static jtree.util.Utils.iter;
+import static jtree.util.Utils.unescapeJava;
 
 import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.BitSet;
 import java.util.Collections;
 import java.util.EnumSet;
 import java.util.Iterator;
@@ -105,7 +107,6 @@ import java.util.function.Supplier;
 import java.util.stream.Collectors;
 
 import org.apache.commons.lang3.tuple.Pair;
-import org.apache.commons.text.StringEscapeUtils;
 
 import jtree.nodes.Annotation;
 import jtree.nodes.AnnotationArgument;
@@ -323,6 +324,11 @@ public class JavaParser {
 
 	protected PreStmtManager preStmts = new PreStmtManager();
 
+	/**
+	 * Token positions at which {@link #parseLambdaOr(Supplier)} has already failed to parse lambda parameters.
+	 */
+	protected final BitSet nonLambdaPositions = new BitSet();
+
 	public JavaParser(CharSequence text) {
 		this(text, "<unknown source>");
 	}
@@ -1854,7 +1860,7 @@ public class JavaParser {
 
 	public ArrayList<Dimension> parseDimensions() {
 		var dimensions = new ArrayList<Dimension>();
-		while(wouldAccept(AT.or(LBRACKET))) {
+		while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			dimensions.add(parseDimension());
 		}
 		return dimensions;
@@ -1888,6 +1894,15 @@ public class JavaParser {
 				|| type.hasTag(Tag.FIELD_MODIFIER)
 				|| type.hasTag(Tag.LOCAL_VAR_MODIFIER));
 	};
+
+	protected static final TokenPredicate<JavaTokenType> ANNOTATION_OR_LBRACKET = AT.or(LBRACKET);
+	protected static final TokenPredicate<JavaTokenType> LOCAL_VAR_START = AT.or(Tag.NAMED).or(Tag.PRIMITIVE_TYPE).or(Tag.LOCAL_VAR_MODIFIER);
+	protected static final TokenPredicate<JavaTokenType> COMMA_OR_RPAREN = COMMA.or(RPAREN);
+	protected static final TokenPredicate<JavaTokenType> SUPER_OR_THIS = SUPER.or(THIS);
+	protected static final TokenPredicate<JavaTokenType> NOT_LPAREN = not(LPAREN);
+	protected static final TokenPredicate<JavaTokenType> LAMBDA_PARAMETER_START = RPAREN.or(AT).or(FINAL).or(PRIMITIVE_TYPES);
+	protected static final TokenPredicate<JavaTokenType> LAMBDA_PARAMETER_NAME_FOLLOW = COMMA.or(RPAREN).or(Tag.NAMED).or(DOT).or(LT).or(LBRACKET).or(AT).or(ELLIPSIS);
+	protected static final TokenPredicate<JavaTokenType> NON = (Token<JavaTokenType> token) -> token.getType() == NAME && token.getString().equals("non");
 	
 	protected void requireSemi() {
 		require(SEMI);
@@ -1895,7 +1910,7 @@ public class JavaParser {
 
 	public Type parseType(List<Annotation> annotations) {
 		var base = parseNonArrayType(annotations);
-		if(wouldAccept(AT.or(LBRACKET))) {
+		if(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			var dimensions = parseDimensions();
 			base.setAnnotations(emptyList());
 			return new ArrayType(base, dimensions, annotations);
@@ -1930,7 +1945,7 @@ public class JavaParser {
 			var dimensions = parseDimensions();
 			dimensions.add(0, dimension);
 			return new ArrayType(base, dimensions, annotations);
-		} else if(wouldAccept(AT.or(LBRACKET))) {
+		} else if(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 			var dimensions = parseDimensions();
 			base.setAnnotations(emptyList());
 			return new ArrayType(base, dimensions, annotations);
@@ -2319,7 +2334,7 @@ public class JavaParser {
 
 	public Statement parseForStmt() {
 		require(FOR, LPAREN);
-		boolean mayHaveVariable = wouldAccept(AT.or(Tag.NAMED).or(Tag.PRIMITIVE_TYPE).or(Tag.LOCAL_VAR_MODIFIER));
+		boolean mayHaveVariable = wouldAccept(LOCAL_VAR_START);
 		if(mayHaveVariable) {
 			foreach:
 			try(var state = tokens.enter()) {
@@ -2456,7 +2471,7 @@ public class JavaParser {
 	}
 
 	public ResourceSpecifier parseResourceSpecifier() {
-		if(wouldAccept(AT.or(Tag.NAMED).or(Tag.PRIMITIVE_TYPE).or(Tag.LOCAL_VAR_MODIFIER))) {
+		if(wouldAccept(LOCAL_VAR_START)) {
 			vardecl:
 			try(var state = tokens.enter()) {
 				var modsAndAnnos = parseFinalAndAnnotations();
@@ -2624,19 +2639,31 @@ public class JavaParser {
 		return parseLambdaOr(this::parseAssignExpr);
 	}
 
+	/**
+	 * @return {@code false} if the upcoming tokens cannot start a lambda expression
+	 */
+	protected boolean mayBeLambda() {
+		return wouldAccept(Tag.NAMED, ARROW)
+				|| wouldAccept(LPAREN, LAMBDA_PARAMETER_START)
+				|| wouldAccept(LPAREN, Tag.NAMED, LAMBDA_PARAMETER_NAME_FOLLOW);
+	}
+
 	public Expression parseLambdaOr(Supplier<? extends Expression> parser) {
-		parse: if(wouldAccept(Tag.NAMED, ARROW) || wouldAccept(LPAREN)) {
+		parse: if(mayBeLambda()) {
+			int mark = tokens.mark();
+			if(nonLambdaPositions.get(mark)) {
+				break parse;
+			}
 			Either<? extends List<FormalParameter>,? extends List<InformalParameter>> parameters;
-			try(var state = tokens.enter()) {
-				try {
-					parameters = parseLambdaParameters();
-					require(ARROW);
-				} catch(SyntaxError e) {
-					state.reset();
-					break parse;
-				}
-				return new Lambda(parameters, parseLambdaBody());
+			try {
+				parameters = parseLambdaParameters();
+				require(ARROW);
+			} catch(SyntaxError e) {
+				tokens.reset(mark);
+				nonLambdaPositions.set(mark);
+				break parse;
 			}
+			return new Lambda(parameters, parseLambdaBody());
 		}
 		return parser.get();
 	}
@@ -2650,7 +2677,7 @@ public class JavaParser {
 			return Either.first(emptyList());
 		}
 		try {
-			if(wouldAccept(Tag.NAMED, COMMA.or(RPAREN))) {
+			if(wouldAccept(Tag.NAMED, COMMA_OR_RPAREN)) {
 				return Either.second(listOf(this::parseInformalParameter));
 			} else {
 				return Either.first(listOf(this::parseFormalParameter));
@@ -2835,29 +2862,28 @@ public class JavaParser {
 
 	public Expression parseCastExpr() {
 		cast: if(wouldAccept(LPAREN)) {
-			try(var state = tokens.enter()) {
-				try {
-					require(LPAREN);
-					Type type;
-					var annotations = parseAnnotations();
-					if(wouldAccept(PRIMITIVE_TYPES, RPAREN)) {
-						type = new PrimitiveType(token.getString(), annotations);
-						nextToken();
-					} else {
-						type = parseTypeIntersection(annotations);
-					}
-					require(RPAREN);
-					Expression expr;
-					if(type instanceof PrimitiveType) {
-						expr = parseUnaryExpr();
-					} else {
-						expr = parseLambdaOr(this::parseUnaryExprNotPlusMinus);
-					}
-					return new CastExpr(type, expr);
-				} catch(SyntaxError e) {
-					state.reset();
-					break cast;
+			int mark = tokens.mark();
+			try {
+				require(LPAREN);
+				Type type;
+				var annotations = parseAnnotations();
+				if(wouldAccept(PRIMITIVE_TYPES, RPAREN)) {
+					type = new PrimitiveType(token.getString(), annotations);
+					nextToken();
+				} else {
+					type = parseTypeIntersection(annotations);
 				}
+				require(RPAREN);
+				Expression expr;
+				if(type instanceof PrimitiveType) {
+					expr = parseUnaryExpr();
+				} else {
+					expr = parseLambdaOr(this::parseUnaryExprNotPlusMinus);
+				}
+				return new CastExpr(type, expr);
+			} catch(SyntaxError e) {
+				tokens.reset(mark);
+				break cast;
 			}
 		}
 		return parsePostfixExpr();
@@ -2882,13 +2908,13 @@ public class JavaParser {
 			if(wouldAccept(COLCOL)) {
 				expr = parseMethodReferenceRest(expr);
 			} else if(wouldAccept(DOT)
-					&& (!wouldAccept(DOT, SUPER.or(THIS)) || wouldAccept(DOT, SUPER.or(THIS), not(LPAREN)))) {
+					&& (!wouldAccept(DOT, SUPER_OR_THIS) || wouldAccept(DOT, SUPER_OR_THIS, NOT_LPAREN))) {
 				List<? extends TypeArgument> typeArguments;
 				if(wouldAccept(DOT, LT)) {
 					try(var state = tokens.enter()) {
 						require(DOT);
 						typeArguments = parseTypeArguments();
-						if(wouldAccept(SUPER.or(THIS), LPAREN)) {
+						if(wouldAccept(SUPER_OR_THIS, LPAREN)) {
 							state.reset();
 							return expr;
 						}
@@ -2984,7 +3010,7 @@ public class JavaParser {
 		require(STRING);
 		str = str.substring(1, str.length() - 1);
 		try {
-			return new Literal(StringEscapeUtils.unescapeJava(str), token.getString());
+			return new Literal(unescapeJava(str), token.getString());
 		} catch(Exception e) {
 			throw new SyntaxError("invalid string literal", filename, token.getStart().getLine(),
 					token.getStart().getColumn(), token.getLine());
@@ -2997,7 +3023,7 @@ public class JavaParser {
 		require(CHARACTER);
 		str = str.substring(1, str.length() - 1);
 		try {
-			str = StringEscapeUtils.unescapeJava(str);
+			str = unescapeJava(str);
 			if(str.length() != 1) {
 				throw new IllegalArgumentException();
 			}
@@ -3209,7 +3235,7 @@ public class JavaParser {
 			if(accept(RBRACKET)) {
 				var dimensions = new ArrayList<Dimension>();
 				dimensions.add(new Dimension(annotations));
-				while(wouldAccept(AT.or(LBRACKET))) {
+				while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 					dimensions.add(parseDimension());
 				}
 				var initializer = parseArrayInitializer(() -> parseInitializer(dimensions.size()));
@@ -3219,7 +3245,7 @@ public class JavaParser {
 				sizes.add(new Size(parseExpression(), annotations));
 				var dimensions = new ArrayList<Dimension>();
 				require(RBRACKET);
-				while(wouldAccept(AT.or(LBRACKET))) {
+				while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 					annotations = parseAnnotations();
 					require(LBRACKET);
 					if(accept(RBRACKET)) {
@@ -3230,7 +3256,7 @@ public class JavaParser {
 						require(RBRACKET);
 					}
 				}
-				while(wouldAccept(AT.or(LBRACKET))) {
+				while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 					dimensions.add(parseDimension());
 				}
 				return new ArrayCreator(base, sizes, dimensions);
@@ -3240,13 +3266,13 @@ public class JavaParser {
 			if(type.getTypeArguments().isEmpty() && wouldAccept(LT, GT)) {
 				return parseClassCreatorRest(emptyList(), type);
 			}
-			if(wouldAccept(AT.or(LBRACKET))) {
+			if(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 				var annotations = parseAnnotations();
 				require(LBRACKET);
 				if(accept(RBRACKET)) {
 					var dimensions = new ArrayList<Dimension>();
 					dimensions.add(new Dimension(annotations));
-					while(wouldAccept(AT.or(LBRACKET))) {
+					while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 						dimensions.add(parseDimension());
 					}
 					var initializer = parseArrayInitializer(() -> parseInitializer(dimensions.size()));
@@ -3256,7 +3282,7 @@ public class JavaParser {
 					sizes.add(new Size(parseExpression(), annotations));
 					var dimensions = new ArrayList<Dimension>();
 					require(RBRACKET);
-					while(wouldAccept(AT.or(LBRACKET))) {
+					while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 						annotations = parseAnnotations();
 						require(LBRACKET);
 						if(accept(RBRACKET)) {
@@ -3267,7 +3293,7 @@ public class JavaParser {
 							require(RBRACKET);
 						}
 					}
-					while(wouldAccept(AT.or(LBRACKET))) {
+					while(wouldAccept(ANNOTATION_OR_LBRACKET)) {
 						dimensions.add(parseDimension());
 					}
 					return new ArrayCreator(type, sizes, dimensions);
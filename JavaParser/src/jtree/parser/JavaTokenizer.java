@@ -21,7 +21,8 @@ public class JavaTokenizer<TokenType> implements Iterator<Token<TokenType>> {
 	protected CharSequence currentLine;
 	protected TokenType defaultType, stringType, numberType, charType, wordType, errorType, commentType;
 	protected Map<String, TokenType> tokens;
-	protected List<String> sortedTokens, wordTokens;
+	protected List<String> irregularWordTokens;
+	protected Map<Character, List<String>> symbolTokens;
 	protected String filename;
 	
 	public JavaTokenizer(@NonNull CharSequence str, TokenType defaultType, TokenType errorType, TokenType stringType,
@@ -65,12 +66,12 @@ public class JavaTokenizer<TokenType> implements Iterator<Token<TokenType>> {
 				assert added;
 			}
 		}*/
-		this.sortedTokens = tokens.keySet().stream()
+		this.symbolTokens = tokens.keySet().stream()
 										   .filter(token -> !isJavaIdentifierPart(token.charAt(token.length()-1)))
 										   .sorted((token1, token2) -> Integer.compare(token2.length(), token1.length()))
-										   .collect(Collectors.toList());
-		this.wordTokens = tokens.keySet().stream()
-										 .filter(token -> isJavaIdentifierPart(token.charAt(token.length()-1)))
+										   .collect(Collectors.groupingBy(token -> token.charAt(0)));
+		this.irregularWordTokens = tokens.keySet().stream()
+										 .filter(token -> isJavaIdentifierPart(token.charAt(token.length()-1)) && !isIdentifier(token))
 										 .sorted((token1, token2) -> Integer.compare(token2.length(), token1.length()))
 										 .collect(Collectors.toList());
 		eatWhite();
@@ -133,10 +134,32 @@ public class JavaTokenizer<TokenType> implements Iterator<Token<TokenType>> {
 		}
 	}
 	
-	protected boolean eat(String sub) {
+	private static boolean isIdentifier(String word) {
+		if(!isJavaIdentifierStart(word.charAt(0))) {
+			return false;
+		}
+		for(int i = 1; i < word.length(); i++) {
+			if(!isJavaIdentifierPart(word.charAt(i))) {
+				return false;
+			}
+		}
+		return true;
+	}
+	
+	protected boolean lookingAt(String sub) {
 		if(pos + sub.length() > str.length()) {
 			return false;
-		} else if(sub.contentEquals(str.subSequence(pos, pos + sub.length()))) {
+		}
+		for(int i = 0; i < sub.length(); i++) {
+			if(str.charAt(pos + i) != sub.charAt(i)) {
+				return false;
+			}
+		}
+		return true;
+	}
+	
+	protected boolean eat(String sub) {
+		if(lookingAt(sub)) {
 			setPos(pos + sub.length());
 			return true;
 		} else {
@@ -145,9 +168,7 @@ public class JavaTokenizer<TokenType> implements Iterator<Token<TokenType>> {
 	}
 	
 	protected boolean eatWord(String sub) {
-		if(pos + sub.length() > str.length()) {
-			return false;
-		} else if(sub.contentEquals(str.subSequence(pos, pos + sub.length())) && (pos + sub.length() == str.length() || !isJavaIdentifierPart(str.charAt(pos + sub.length())))) {
+		if(lookingAt(sub) && (pos + sub.length() == str.length() || !isJavaIdentifierPart(str.charAt(pos + sub.length())))) {
 			setPos(pos + sub.length());
 			return true;
 		} else {
@@ -189,36 +210,48 @@ public class JavaTokenizer<TokenType> implements Iterator<Token<TokenType>> {
 			return eatNumber();
 		}
 		var start = new Position(line, column);
-		for(String word : wordTokens) {
+		for(String word : irregularWordTokens) {
 			if(eatWord(word)) {
 				var end = new Position(line, column);
 				return new Token<>(tokens.get(word), word, start, end, currentLine);
 			}
 		}
-		for(String symbol : sortedTokens) {
-			if(eat(symbol)) {
+		
+		String content = null;
+		if(isJavaIdentifierStart(ch)) {
+			int endPos = pos+1;
+			while(endPos < str.length() && isJavaIdentifierPart(str.charAt(endPos))) {
+				endPos++;
+			}
+			content = str.subSequence(pos, endPos).toString();
+			var type = tokens.get(content);
+			if(type != null) {
+				setPos(endPos);
 				var end = new Position(line, column);
-				return new Token<>(tokens.get(symbol), symbol, start, end, currentLine);
+				return new Token<>(type, content, start, end, currentLine);
 			}
 		}
 		
-		int startPos = pos;
-		
-		if(isJavaIdentifierStart(ch)) {
-			int endPos = pos+1;
-			nextChar();
-			while(pos < str.length() && isJavaIdentifierPart(ch)) {
-				endPos = pos+1;
-				nextChar();
+		var symbols = symbolTokens.get(ch);
+		if(symbols != null) {
+			for(String symbol : symbols) {
+				if(eat(symbol)) {
+					var end = new Position(line, column);
+					return new Token<>(tokens.get(symbol), symbol, start, end, currentLine);
+				}
 			}
+		}
+		
+		if(content != null) {
+			setPos(pos + content.length());
 			var end = new Position(line, column);
-			var content = str.subSequence(startPos, endPos).toString();
 			if(!Name.isValidName(content)) {
 				throw new AssertionError(StringEscapeUtils.escapeJava(content));
 			}
 			return new Token<>(wordType, content, start, end, currentLine);
 		}
 
+		int startPos = pos;
 		nextChar();
 		var end = new Position(line, column);
 		return new Token<>(errorType, str.subSequence(startPos, pos).toString(), start, end, currentLine);
@@ -3,8 +3,10 @@ package jtree.parser;
 import static jtree.parser.JavaTokenType.*;
 
 import java.io.File;
-import java.lang.reflect.InvocationTargetException;
+import java.lang.invoke.MethodHandles;
 import java.lang.reflect.Modifier;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
 import java.util.ArrayList;
 import java.util.Collection;
 import java.util.HashMap;
@@ -26,6 +28,8 @@ import jtree.nodes.REPLEntry;
 import jtree.nodes.Statement;
 import jtree.util.Either;
 import jtree.util.Utils;
+import lombok.AccessLevel;
+import lombok.Getter;
 import lombok.SneakyThrows;
 
 public class Tester {
@@ -33,7 +37,8 @@ public class Tester {
 		new Tester().run();
 	}*/
 	
-	protected final Map<String, Function<String, Object>> methods = getMethodMap();
+	@Getter(value = AccessLevel.PROTECTED, lazy = true)
+	private final Map<String, Function<String, Object>> methods = getMethodMap();
 	
 	protected final Scanner keys = new Scanner(System.in);
 	
@@ -104,9 +109,8 @@ public class Tester {
 		if(!file.exists() || !file.isFile()) {
 			System.out.println("File not found: " + args[0]);
 		}
-		try(var scan = new Scanner(file)) {
-			scan.useDelimiter("\\A");
-			var text = scan.next();
+		try {
+			var text = new String(Files.readAllBytes(file.toPath()), StandardCharsets.UTF_8);
 			var parser = createParser(text, file.getName());
 			printNodeString(parser.parseCompilationUnit());
 		} catch(Exception e) {
@@ -225,7 +229,7 @@ public class Tester {
 	
 	protected void parse(String[] args) {
 		if(args.length == 0) {
-			listParseMethods(methods.keySet());
+			listParseMethods(getMethods().keySet());
 		} else if(args[0].equals("-f")) {
 			searchForParseMethods(args);
 		} else {
@@ -267,7 +271,7 @@ public class Tester {
 			}
 		}
 		var results = new ArrayList<String>();
-		for(var name : methods.keySet()) {
+		for(var name : getMethods().keySet()) {
 			boolean matches = false;
 			for(var searchTerm : searchTerms) {
 				if(searchTerm.startsWith("-")) {
@@ -430,7 +434,7 @@ public class Tester {
 			if(parseMethodName.equals("statement")) {
 				parseMethodName = "blockStatement";
 			}
-			parseMethod = methods.get(parseMethodName);
+			parseMethod = getMethods().get(parseMethodName);
 			if(parseMethod == null) {
 				System.out.println("Unknown parse method: " + args[index]);
 				return;
@@ -605,6 +609,7 @@ public class Tester {
 			for(var method : parserType.getMethods()) {
 				if(!Modifier.isStatic(method.getModifiers()) && method.getParameterCount() == 0
 						&& method.getName().startsWith("parse") && method.getReturnType() != void.class) {
+					var handle = MethodHandles.lookup().unreflect(method);
 					methods.put(Character.toLowerCase(method.getName().charAt(5)) + method.getName().substring(6),
 							new Function<>() {
 								@SuppressWarnings({ "unchecked", "rawtypes" })
@@ -614,7 +619,7 @@ public class Tester {
 									Object result;
 									try(var $1 = parser.preStmts.enter();
 											var $2 = parser.typeNames.enter(new Name("$Shell"))) {
-										var obj = method.invoke(parser);
+										var obj = handle.invoke(parser);
 										if(parser.preStmts.isEmpty()) {
 											result = obj;
 										} else {
@@ -629,8 +634,6 @@ public class Tester {
 												result = list;
 											}
 										}
-									} catch(InvocationTargetException e) {
-										throw e.getCause();
 									}
 									if(!parser.accept(ENDMARKER)) {
 										throw parser.syntaxError("unexpected token " + parser.token, parser.token);
@@ -1,17 +1,18 @@
 package jtree.util;
 
 import java.util.ArrayList;
+import java.util.Arrays;
 import java.util.Iterator;
-import java.util.List;
 import java.util.ListIterator;
-import java.util.Stack;
+import java.util.Objects;
 import java.util.function.Consumer;
 
 import lombok.Setter;
 
 public class LookAheadListIterator<T> implements ListIterator<T>, Iterable<T> {
-	private List<T> items;
-	private Stack<Integer> marks = new Stack<>();
+	private final Object[] items;
+	private int[] marks = new int[16];
+	private int markCount;
 	private int index;
 	private Consumer<? super T> setter;
 	
@@ -20,31 +21,37 @@ public class LookAheadListIterator<T> implements ListIterator<T>, Iterable<T> {
 	}
 	
 	public LookAheadListIterator(Iterable<? extends T> items, Consumer<? super T> setter) {
-		this.items = new ArrayList<>();
+		var list = new ArrayList<T>();
 		for(T t : items) {
-			this.items.add(t);
+			list.add(t);
 		}
-		if(this.items.isEmpty()) {
+		if(list.isEmpty()) {
 			throw new IllegalArgumentException("No items given");
 		}
+		this.items = list.toArray();
 		this.setter = setter;
 	}
 	
+	@SuppressWarnings("unchecked")
+	private T get(int i) {
+		return (T)items[i];
+	}
+	
 	@Override
 	public T next() {
-		if(index == items.size()) {
-			return items.get(items.size()-1);
+		if(index == items.length) {
+			return get(items.length-1);
 		} else {
-			return items.get(index++);
+			return get(index++);
 		}
 	}
 	
 	@Override
 	public T previous() {
 		if(index == 0) {
-			return items.get(0);
+			return get(0);
 		} else {
-			return items.get(--index);
+			return get(--index);
 		}
 	}
 	
@@ -52,10 +59,10 @@ public class LookAheadListIterator<T> implements ListIterator<T>, Iterable<T> {
 		int i = index + look;
 		if(i < 0) {
 			i = 0;
-		} else if(i >= items.size()) {
-			i = items.size()-1;
+		} else if(i >= items.length) {
+			i = items.length-1;
 		}
-		return items.get(i);
+		return get(i);
 	}
 	
 	public class ResettableMarkContext implements AutoCloseable {
@@ -82,21 +89,41 @@ public class LookAheadListIterator<T> implements ListIterator<T>, Iterable<T> {
 				throw new IllegalStateException("ResettableMarkContext has already been closed");
 			}
 			closed = true;
+			int mark = marks[--markCount];
 			if(reset) {
-				index = marks.pop();
+				index = mark;
 				if(setter != null) {
 					setter.accept(look(-1));
 				}
-			} else {
-				marks.pop();
 			}
 		}
 	}
 	
 	public ResettableMarkContext enter() {
-		marks.push(index);
+		if(markCount == marks.length) {
+			marks = Arrays.copyOf(marks, markCount*2);
+		}
+		marks[markCount++] = index;
 		return new ResettableMarkContext();
 	}
+	
+	/**
+	 * @return the current position, which can later be passed to {@link #reset(int)}
+	 */
+	public int mark() {
+		return index;
+	}
+	
+	/**
+	 * Moves back to a position previously returned by {@link #mark()}.
+	 */
+	public void reset(int mark) {
+		Objects.checkIndex(mark, items.length+1);
+		index = mark;
+		if(setter != null) {
+			setter.accept(look(-1));
+		}
+	}
 
 	@Override
 	public Iterator<T> iterator() {
@@ -105,15 +132,15 @@ public class LookAheadListIterator<T> implements ListIterator<T>, Iterable<T> {
 
 			@Override
 			public boolean hasNext() {
-				return pos < items.size();
+				return pos < items.length;
 			}
 
 			@Override
 			public T next() {
-				if(pos >= items.size()) {
+				if(pos >= items.length) {
 					throw new IllegalArgumentException();
 				} else {
-					return items.get(pos++);
+					return get(pos++);
 				}
 			}
 		};
@@ -121,7 +148,7 @@ public class LookAheadListIterator<T> implements ListIterator<T>, Iterable<T> {
 
 	@Override
 	public boolean hasNext() {
-		return index < items.size();
+		return index < items.length;
 	}
 
 	@Override
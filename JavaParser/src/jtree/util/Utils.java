@@ -8,6 +8,8 @@ import java.util.List;
 import java.util.Objects;
 import java.util.function.Function;
 
+import org.apache.commons.text.StringEscapeUtils;
+
 import jtree.nodes.INode;
 import lombok.NonNull;
 import lombok.experimental.UtilityClass;
@@ -78,4 +80,12 @@ public class Utils {
 		return sb.toString();
 	}
 	
+	/**
+	 * Same as {@link StringEscapeUtils#unescapeJava(String)}, but returns strings without any
+	 * backslashes as-is instead of copying them.
+	 */
+	public String unescapeJava(String str) {
+		return str.indexOf('\\') < 0? str : StringEscapeUtils.unescapeJava(str);
+	}
+	
 }
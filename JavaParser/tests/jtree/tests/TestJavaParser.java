@@ -0,0 +1,46 @@
+package jtree.tests;
+
+import static org.junit.jupiter.api.Assertions.*;
+
+import org.junit.jupiter.api.Test;
+
+import jtree.nodes.ArrayType;
+import jtree.nodes.Dimension;
+import jtree.parser.JavaParser;
+
+class TestJavaParser {
+	
+	static class Parser extends JavaParser {
+		Parser(CharSequence text) {
+			super(text);
+		}
+		
+		int mark() {
+			return tokens.mark();
+		}
+		
+		void reset(int mark) {
+			tokens.reset(mark);
+		}
+	}
+
+	@Test
+	void testReparseType() {
+		var parser = new Parser("int[] x = {}");
+		int mark = parser.mark();
+		
+		var first = (ArrayType)parser.parseType();
+		first.getDimensions().add(new Dimension());
+		assertEquals("int[][]", first.toCode());
+		
+		parser.reset(mark);
+		var second = parser.parseType();
+		assertEquals("int[]", second.toCode());
+		assertNotSame(first, second);
+		assertEquals("x", parser.parseName().toCode());
+		
+		parser.reset(mark);
+		assertNotSame(second, parser.parseType());
+	}
+
+}
@@ -2,6 +2,7 @@ package jtree.tests;
 
 import static org.junit.jupiter.api.Assertions.*;
 
+import java.util.ArrayList;
 import java.util.List;
 import java.util.stream.Collectors;
 
@@ -88,5 +89,27 @@ class TestLookAheadListIterator {
 		
 		
 	}
+	
+	@Test
+	void test3() {
+		var set = new ArrayList<Integer>();
+		var iter = new LookAheadListIterator<>(List.of(1,2,3,4,5,6), set::add);
+		
+		assertEquals(1, iter.next());
+		assertEquals(2, iter.next());
+		
+		int mark = iter.mark();
+		assertEquals(3, iter.next());
+		assertEquals(4, iter.next());
+		assertEquals(5, iter.next());
+		
+		iter.reset(mark);
+		assertEquals(List.of(2), set);
+		assertEquals(3, iter.look(0));
+		assertEquals(3, iter.next());
+		
+		assertThrows(IndexOutOfBoundsException.class, () -> iter.reset(7));
+		assertThrows(IndexOutOfBoundsException.class, () -> iter.reset(-1));
+	}
 
 }